@@ -0,0 +1,97 @@
+"""
+Disk writes and component reloads per GUI config save.
+
+Builds the real wiring against the fake backends, then applies the same
+three assignments ConfigPage._save_config makes (FROZEN_COORDS,
+UNFROZEN_COORDS, GAME_EXE_NAME), once field by field and once inside
+Config.transaction(). A reload is one call of a subscriber to those
+fields, as the profile recompile in _build() is. Config is written to a
+temp file, never to config/config.json. Exits with status 1 unless a
+transactional save costs exactly one write and one reload. Run from the repo root:
+
+    python -m benchmarks.bench_config_save [saves]
+"""
+import os
+import sys
+import tempfile
+from time import perf_counter_ns
+
+from src.mouse_hider import _build
+from src.mouse_hider.config import Config, ConfigWriter, SingletonMeta, load_config
+from src.mouse_hider.focus_watcher import FocusWatcher
+from src.mouse_hider.hotkey_handler import KeyboardDispatcher
+from src.mouse_hider.mouse_freezer import MouseFreezer
+from src.mouse_hider.profiles import COORD_FIELDS
+from src.mouse_hider.backends.confine import FakeConfineBackend
+from src.mouse_hider.backends.focus import FakeFocusBackend
+from src.mouse_hider.backends.keyboard import FakeKeyboardBackend
+from src.mouse_hider.backends.mouse import FakeMouseBackend
+
+
+def _gui_save(config: Config, i: int):
+    config.FROZEN_COORDS = [100 + i, 200]
+    config.UNFROZEN_COORDS = [300 + i, 400]
+    config.GAME_EXE_NAME = f"Game{i % 2}.exe"
+
+
+def _measure(config, writer, reloads: list, save, saves: int) -> dict:
+    writes0, reloads0 = writer.writes, len(reloads)
+    elapsed = 0
+    for i in range(saves):
+        t0 = perf_counter_ns()
+        save(config, i)
+        elapsed += perf_counter_ns() - t0
+        writer.flush()
+    return {
+        "writes_per_save": (writer.writes - writes0) / saves,
+        "reloads_per_save": (len(reloads) - reloads0) / saves,
+        "us_per_save": elapsed / saves / 1e3,
+    }
+
+
+def _transactional_save(config, i):
+    with config.transaction():
+        _gui_save(config, i)
+
+
+def run(saves: int) -> dict:
+    SingletonMeta._instances.pop(Config, None)
+    FocusWatcher._instance = None
+    MouseFreezer._instance = None
+    KeyboardDispatcher._instance = None
+    config = load_config()
+    fd, path = tempfile.mkstemp(suffix=".json")
+    os.close(fd)
+    writer = ConfigWriter(path, debounce=0)     # every notification is a write
+    config.add_batch_callback(lambda cfg, changes: writer.schedule(cfg))
+    mouse = FakeMouseBackend()
+    components = _build(focus_backend=FakeFocusBackend(),
+                        keyboard_backend=FakeKeyboardBackend(),
+                        mouse_backend=mouse,
+                        confine_backend=FakeConfineBackend(mouse))
+    reloads: list[int] = []
+    config.add_batch_callback(lambda *_: reloads.append(1),
+                              fields=("GAME_EXE_NAME",) + COORD_FIELDS)
+    try:
+        return {
+            "per_field": _measure(config, writer, reloads, _gui_save, saves),
+            "transaction": _measure(config, writer, reloads, _transactional_save, saves),
+        }
+    finally:
+        components.teardown()
+        os.remove(path)
+
+
+def main():
+    saves = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    results = run(saves)
+    print(f"{'save':<12} {'writes/save':>12} {'reloads/save':>13} {'us/save':>9}")
+    for name, r in results.items():
+        print(f"{name:<12} {r['writes_per_save']:>12.2f} {r['reloads_per_save']:>13.2f} "
+              f"{r['us_per_save']:>9.1f}")
+    tx = results["transaction"]
+    return 0 if tx["writes_per_save"] == 1 and tx["reloads_per_save"] == 1 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,98 @@
+"""
+Focus gain/loss notification latency against the fake focus backend.
+
+Measures the time from FakeFocusBackend.set_foreground() to FocusWatcher
+calling on_gain / on_loss on its own thread. Exits with status 1 when the
+median of either exceeds --p50-ms or the p99 exceeds --p99-ms; the
+polling loop this replaced took up to FOCUS_CHECK_INTERVAL (1 s). Run from
+the repo root:
+
+    python -m benchmarks.bench_focus [-n switches]
+"""
+import argparse
+import sys
+from threading import Event
+from time import perf_counter_ns
+
+from src.mouse_hider.config import Config, SingletonMeta, load_config
+from src.mouse_hider.focus_watcher import FocusWatcher
+from src.mouse_hider.backends.focus import FakeFocusBackend
+
+GAME_PID = 4242
+OTHER_PID = 4243
+TIMEOUT_S = 1.0
+
+
+class _Probe:
+    """on_gain / on_loss that stamp the time they were called."""
+
+    def __init__(self):
+        self.at_ns = 0
+        self.fired = Event()
+
+    def __call__(self):
+        self.at_ns = perf_counter_ns()
+        self.fired.set()
+
+    def wait(self, since_ns: int) -> int:
+        if not self.fired.wait(TIMEOUT_S):
+            raise TimeoutError("no focus notification within %.1fs" % TIMEOUT_S)
+        self.fired.clear()
+        return self.at_ns - since_ns
+
+
+def _percentile(sorted_values: list[int], q: float) -> int:
+    return sorted_values[min(len(sorted_values) - 1, round(q * (len(sorted_values) - 1)))]
+
+
+def run(switches: int) -> dict:
+    SingletonMeta._instances.pop(Config, None)
+    FocusWatcher._instance = None
+    game = load_config().GAME_EXE_NAME
+    backend = FakeFocusBackend()
+    gain, loss = _Probe(), _Probe()
+    watcher = FocusWatcher(on_gain=gain, on_loss=loss, backend=backend)
+    watcher.start()
+    samples: dict[str, list[int]] = {"gain": [], "loss": []}
+    try:
+        for _ in range(switches):
+            t0 = perf_counter_ns()
+            backend.set_foreground(GAME_PID, game)
+            samples["gain"].append(gain.wait(t0))
+            t0 = perf_counter_ns()
+            backend.set_foreground(OTHER_PID, "explorer.exe")
+            samples["loss"].append(loss.wait(t0))
+    finally:
+        watcher.stop()
+        FocusWatcher._instance = None
+    results = {}
+    for name, values in samples.items():
+        values.sort()
+        results[name] = {
+            "p50_ms": _percentile(values, 0.50) / 1e6,
+            "p99_ms": _percentile(values, 0.99) / 1e6,
+            "max_ms": values[-1] / 1e6,
+        }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("-n", "--switches", type=int, default=500)
+    parser.add_argument("--p50-ms", type=float, default=2.0)
+    parser.add_argument("--p99-ms", type=float, default=20.0)
+    args = parser.parse_args()
+
+    results = run(args.switches)
+    failed = False
+    print(f"{'event':<6} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    for name, r in results.items():
+        print(f"{name:<6} {r['p50_ms']:>8.3f} {r['p99_ms']:>8.3f} {r['max_ms']:>8.3f}")
+        if r["p50_ms"] > args.p50_ms or r["p99_ms"] > args.p99_ms:
+            print(f"FAIL {name}: over {args.p50_ms} ms p50 / {args.p99_ms} ms p99")
+            failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
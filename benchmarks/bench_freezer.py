@@ -0,0 +1,105 @@
+"""
+Wakeups per second and CPU time of the cursor keeper.
+
+Compares the old fixed-interval loop against MouseFreezer's "poll",
+"event" and "confine" modes, using the fake mouse and confine backends.
+Run from the repo root:
+
+    python -m benchmarks.bench_freezer [seconds-per-scenario]
+"""
+import sys
+import time
+from threading import Thread
+
+from src.mouse_hider.config import load_config
+from src.mouse_hider.mouse_freezer import MouseFreezer
+from src.mouse_hider.scheduler import Scheduler
+from src.mouse_hider.backends.confine import FakeConfineBackend
+from src.mouse_hider.backends.mouse import FakeMouseBackend
+
+MOVE_HZ = 125       # typical USB mouse report rate
+
+
+def _new_freezer(mode: str) -> MouseFreezer:
+    MouseFreezer._instance = None
+    config = load_config()
+    config.POSITION_MODE = mode
+    mouse = FakeMouseBackend()
+    return MouseFreezer(mouse=mouse, confine=FakeConfineBackend(mouse))
+
+
+class LegacyKeeper:
+    """The pre-event-mode `_maintain_position` loop, kept for comparison."""
+
+    def __init__(self, freezer: MouseFreezer):
+        self.freezer = freezer
+        self.wakeups = 0
+        self.running = True
+
+    def run(self):
+        f = self.freezer
+        while self.running:
+            self.wakeups += 1
+            if f.freeze_flag:
+                f.mouse.position = f.frozen_coords
+            time.sleep(f.config.POSITION_CHECK_INTERVAL)
+
+
+def _scenario(freezer, counter, frozen: bool, moving: bool, seconds: float):
+    if frozen:
+        freezer.freeze()
+    else:
+        freezer.unfreeze()
+    start_wakeups = counter()
+    start_writes = freezer.mouse.writes
+    cpu0, t0 = time.process_time(), time.perf_counter()
+    x, y = freezer.frozen_coords
+    while time.perf_counter() - t0 < seconds:
+        if moving:
+            freezer.mouse.user_move(x + 1, y)
+        time.sleep(1 / MOVE_HZ)
+    elapsed = time.perf_counter() - t0
+    return {
+        "wakeups_per_s": (counter() - start_wakeups) / elapsed,
+        "writes_per_s": (freezer.mouse.writes - start_writes) / elapsed,
+        "cpu_s": time.process_time() - cpu0,
+    }
+
+
+def run(seconds: float) -> dict:
+    results = {}
+    for name in ("legacy", "poll", "event", "confine"):
+        freezer = _new_freezer("poll" if name == "legacy" else name)
+        if name == "legacy":
+            keeper = LegacyKeeper(freezer)
+            Thread(target=keeper.run, daemon=True).start()
+            counter = lambda: keeper.wakeups
+        else:
+            freezer.start()
+            Scheduler().start()
+            counter = lambda: freezer.wakeups
+        results[name] = {
+            "unfrozen": _scenario(freezer, counter, False, False, seconds),
+            "frozen_idle": _scenario(freezer, counter, True, False, seconds),
+            "frozen_moving": _scenario(freezer, counter, True, True, seconds),
+        }
+        freezer.unfreeze()
+        if name == "legacy":
+            keeper.running = False
+        else:
+            freezer.stop()
+    return results
+
+
+def main():
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 2.0
+    results = run(seconds)
+    print(f"{'mode':<8} {'scenario':<14} {'wakeups/s':>10} {'writes/s':>10} {'cpu s':>8}")
+    for mode, scenarios in results.items():
+        for scenario, r in scenarios.items():
+            print(f"{mode:<8} {scenario:<14} {r['wakeups_per_s']:>10.1f} "
+                  f"{r['writes_per_s']:>10.1f} {r['cpu_s']:>8.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,315 @@
+"""
+End-to-end hotkey latency: fake keypress -> cursor frozen / released.
+
+Runs the real `src.mouse_hider.main()` wiring against the fake keyboard,
+mouse and focus backends, so it works on Linux without any input hooks.
+Results are written as JSON and compared with a stored baseline:
+
+    python -m benchmarks.bench_latency                    # compare
+    python -m benchmarks.bench_latency --update-baseline  # re-record
+    python -m benchmarks.bench_latency --asyncio          # AsyncRuntime
+
+Each scenario is run --runs times and the per-run figures are reduced to
+their median. Exits with status 1 when a scenario's p50 regresses past the
+tolerance; p99 and max (with n=200, p99 is the second-slowest sample) are
+reported but too noisy to gate on. It also exits with status 1 unless Space
+pressed with no gap after the cam-7 hotkey is swallowed and remapped.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from statistics import median
+from threading import Event, Thread
+
+from src.mouse_hider import main as background_main
+from src.mouse_hider.config import Config, SingletonMeta, load_config
+from src.mouse_hider.focus_watcher import FocusWatcher
+from src.mouse_hider.hotkey_handler import KeyboardDispatcher
+from src.mouse_hider.mouse_freezer import MouseFreezer
+from src.mouse_hider.runtime import AsyncRuntime
+from src.mouse_hider.backends.confine import FakeConfineBackend
+from src.mouse_hider.backends.focus import FakeFocusBackend
+from src.mouse_hider.backends.keyboard import FakeKeyboardBackend
+from src.mouse_hider.backends.mouse import FakeMouseBackend
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+BASELINE_PATH = os.path.join(HERE, "latency_baseline.json")
+RESULTS_PATH = os.path.join(HERE, "results", "latency.json")
+
+GAME_PID = 4242
+OTHER_PID = 4243
+TIMEOUT_S = 1.0
+
+
+def _wait_for(predicate, start_ns: int) -> int:
+    """Spin (yielding the GIL) until predicate() holds; returns elapsed ns."""
+    deadline = start_ns + int(TIMEOUT_S * 1e9)
+    while not predicate():
+        now = time.perf_counter_ns()
+        if now > deadline:
+            raise TimeoutError("condition not reached within %.1fs" % TIMEOUT_S)
+        time.sleep(0)
+    return time.perf_counter_ns() - start_ns
+
+
+class Harness:
+
+    def __init__(self, use_asyncio: bool = False):
+        # fresh singletons so main() builds everything against the fakes
+        SingletonMeta._instances.pop(Config, None)
+        FocusWatcher._instance = None
+        MouseFreezer._instance = None
+        KeyboardDispatcher._instance = None
+        self.config = load_config()
+        self.keyboard = FakeKeyboardBackend()
+        self.mouse = FakeMouseBackend()
+        self.focus = FakeFocusBackend()
+        self.hook_block_ns: list[int] = []
+        backends = dict(focus_backend=self.focus,
+                        keyboard_backend=self.keyboard,
+                        mouse_backend=self.mouse,
+                        confine_backend=FakeConfineBackend(self.mouse))
+        self.runtime = AsyncRuntime(**backends) if use_asyncio else None
+        self.stop_event = Event()
+        self.thread = Thread(
+            target=background_main, args=(self.stop_event,),
+            kwargs=backends, daemon=True)
+
+    def start(self):
+        if self.runtime:
+            self.runtime.start()
+        else:
+            self.thread.start()
+        _wait_for(lambda: FocusWatcher._instance is not None
+                  and FocusWatcher._instance._started, time.perf_counter_ns())
+        self.watcher = FocusWatcher()
+        self.freezer = MouseFreezer()
+        self.focus_game()
+
+    def stop(self):
+        if self.runtime:
+            self.runtime.stop(timeout=2)
+        else:
+            self.stop_event.set()
+            self.thread.join(timeout=2)
+
+    # -- helpers ----------------------------------------------------
+    def focus_game(self) -> int:
+        t0 = time.perf_counter_ns()
+        self.focus.set_foreground(GAME_PID, self.config.GAME_EXE_NAME)
+        return _wait_for(lambda: self.watcher.game_focused, t0)
+
+    def focus_other(self) -> int:
+        t0 = time.perf_counter_ns()
+        self.focus.set_foreground(OTHER_PID, "explorer.exe")
+        return _wait_for(lambda: not self.watcher.game_focused, t0)
+
+    def press(self, scan_code: int) -> int:
+        """Fake keypress; records how long the hook callback blocked."""
+        t0 = time.perf_counter_ns()
+        self.keyboard.press(scan_code)
+        self.hook_block_ns.append(time.perf_counter_ns() - t0)
+        return t0
+
+    def release(self, scan_code: int) -> int:
+        t0 = time.perf_counter_ns()
+        self.keyboard.release(scan_code)
+        self.hook_block_ns.append(time.perf_counter_ns() - t0)
+        return t0
+
+    def tap(self, scan_code: int, predicate) -> int:
+        t0 = self.press(scan_code)
+        elapsed = _wait_for(predicate, t0)
+        self.release(scan_code)
+        return elapsed
+
+    def enter_cam7(self):
+        if not self.freezer.freeze_flag:
+            self.tap(self.config.HOTKEY_SC, lambda: self.freezer.freeze_flag)
+        self.tap(self.config.DEACTIVATION_HOTKEY_SC,
+                 lambda: not self.freezer.freeze_flag)
+
+    # -- scenarios --------------------------------------------------
+    def toggle(self) -> int:
+        want = not self.freezer.freeze_flag
+        return self.tap(self.config.HOTKEY_SC,
+                        lambda: self.freezer.freeze_flag == want)
+
+    def cam7_entry(self) -> int:
+        if not self.freezer.freeze_flag:
+            self.tap(self.config.HOTKEY_SC, lambda: self.freezer.freeze_flag)
+        return self.tap(self.config.DEACTIVATION_HOTKEY_SC,
+                        lambda: not self.freezer.freeze_flag)
+
+    def space_remap_press(self) -> int:
+        self.enter_cam7()
+        sc = self.config.SPACE_HOTKEY_SC
+        t0 = self.press(sc)
+        elapsed = _wait_for(lambda: "right" in self.mouse.pressed, t0)
+        self.release(sc)
+        _wait_for(lambda: "right" not in self.mouse.pressed, time.perf_counter_ns())
+        return elapsed
+
+    def space_remap_release(self) -> int:
+        self.enter_cam7()
+        sc = self.config.SPACE_HOTKEY_SC
+        self.press(sc)
+        _wait_for(lambda: "right" in self.mouse.pressed, time.perf_counter_ns())
+        t0 = self.release(sc)
+        return _wait_for(lambda: "right" not in self.mouse.pressed, t0)
+
+    def space_right_after_cam7(self) -> bool:
+        """Space pressed straight after the deactivation hotkey, before the
+        state machine has caught up; True if it became a right-click."""
+        if not self.freezer.freeze_flag:
+            self.tap(self.config.HOTKEY_SC, lambda: self.freezer.freeze_flag)
+        self.keyboard.press(self.config.DEACTIVATION_HOTKEY_SC)
+        self.keyboard.release(self.config.DEACTIVATION_HOTKEY_SC)
+        sc = self.config.SPACE_HOTKEY_SC
+        t0 = time.perf_counter_ns()
+        swallowed = not self.keyboard.press(sc)
+        if swallowed:
+            _wait_for(lambda: "right" in self.mouse.pressed, t0)
+        self.keyboard.release(sc)
+        _wait_for(lambda: "right" not in self.mouse.pressed, time.perf_counter_ns())
+        return swallowed
+
+    def q_exit(self) -> int:
+        self.enter_cam7()
+        return self.tap(self.config.Q_SCAN_CODE, lambda: self.freezer.freeze_flag)
+
+    def e_exit(self) -> int:
+        self.enter_cam7()
+        return self.tap(self.config.E_SCAN_CODE, lambda: self.freezer.freeze_flag)
+
+    def focus_gain(self) -> int:
+        self.focus_other()
+        return self.focus_game()
+
+    def focus_loss(self) -> int:
+        latency = self.focus_other()
+        self.focus_game()
+        return latency
+
+
+SCENARIOS = ("toggle", "cam7_entry", "space_remap_press", "space_remap_release",
+             "q_exit", "e_exit", "focus_gain", "focus_loss")
+
+
+def _percentile(sorted_values: list[int], q: float) -> int:
+    index = min(len(sorted_values) - 1, round(q * (len(sorted_values) - 1)))
+    return sorted_values[index]
+
+
+def summarize(samples_ns: list[int]) -> dict:
+    values = sorted(samples_ns)
+    return {
+        "n": len(values),
+        "p50_us": _percentile(values, 0.50) / 1e3,
+        "p99_us": _percentile(values, 0.99) / 1e3,
+        "max_us": values[-1] / 1e3,
+    }
+
+
+def run_once(iterations: int, use_asyncio: bool = False) -> dict:
+    harness = Harness(use_asyncio)
+    harness.start()
+    try:
+        results = {}
+        for name in SCENARIOS:
+            scenario = getattr(harness, name)
+            results[name] = summarize([scenario() for _ in range(iterations)])
+        # time the hook callback itself blocked, across every fake keypress
+        results["hook_block"] = summarize(harness.hook_block_ns)
+    finally:
+        harness.stop()
+    return results
+
+
+def run(iterations: int, use_asyncio: bool = False, runs: int = 1) -> dict:
+    """Median of each figure across `runs` independent runs."""
+    per_run = [run_once(iterations, use_asyncio) for _ in range(runs)]
+    return {
+        name: {key: median(r[name][key] for r in per_run) for key in stats}
+        for name, stats in per_run[0].items()
+    }
+
+
+def check_space_remap(iterations: int, use_asyncio: bool = False) -> int:
+    """How many of `iterations` back-to-back cam-7 + Space presses were
+    remapped."""
+    harness = Harness(use_asyncio)
+    harness.start()
+    try:
+        return sum(harness.space_right_after_cam7() for _ in range(iterations))
+    finally:
+        harness.stop()
+
+
+def compare(results: dict, baseline: dict, tolerance: float, slack_us: float) -> list[str]:
+    regressions = []
+    for name, current in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        limit = base["p50_us"] * (1 + tolerance) + slack_us
+        if current["p50_us"] > limit:
+            regressions.append(
+                f"{name}: p50 {current['p50_us']:.1f}us > {limit:.1f}us "
+                f"(baseline {base['p50_us']:.1f}us)")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("-n", "--iterations", type=int, default=200)
+    parser.add_argument("-r", "--runs", type=int, default=3,
+                        help="independent runs to take the median of")
+    parser.add_argument("--tolerance", type=float, default=0.5,
+                        help="allowed relative p50 increase (default 0.5 = +50%%)")
+    parser.add_argument("--slack-us", type=float, default=100.0,
+                        help="absolute p50 slack to absorb scheduler noise")
+    parser.add_argument("--output", default=RESULTS_PATH)
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--asyncio", action="store_true",
+                        help="run the wiring on AsyncRuntime instead of threads")
+    args = parser.parse_args()
+
+    results = run(args.iterations, args.asyncio, args.runs)
+
+    print(f"{'scenario':<20} {'p50 us':>9} {'p99 us':>9} {'max us':>9}")
+    for name, r in results.items():
+        print(f"{name:<20} {r['p50_us']:>9.1f} {r['p99_us']:>9.1f} {r['max_us']:>9.1f}")
+
+    remapped = check_space_remap(args.iterations, args.asyncio)
+    print(f"space right after cam-7: {remapped}/{args.iterations} remapped")
+    if remapped != args.iterations:
+        print("FAIL space pressed right after the cam-7 hotkey was not remapped")
+        return 1
+
+    os.makedirs(os.path.dirname(args.output), exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=4)
+
+    if args.update_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(results, f, indent=4)
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --update-baseline.")
+        return 0
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    regressions = compare(results, baseline, args.tolerance, args.slack_us)
+    for line in regressions:
+        print("REGRESSION", line)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,73 @@
+"""
+Keyboard hook installs and dispatch-table rebinds per config field change.
+
+Builds the real wiring against the fake backends and assigns one field at
+a time, counting `hotkey.hooks_installed` and `hotkey.rebinds`. Nothing is
+saved to config/config.json. Exits with status 1 unless every change
+matches EXPECTED: no field reinstalls the hook, and only hotkey fields
+rebind. Run from the repo root:
+
+    python -m benchmarks.bench_rehook
+"""
+import sys
+
+from src.mouse_hider import _build
+from src.mouse_hider.config import Config, SingletonMeta, load_config
+from src.mouse_hider.focus_watcher import FocusWatcher
+from src.mouse_hider.hotkey_handler import KeyboardDispatcher
+from src.mouse_hider.metrics import REGISTRY
+from src.mouse_hider.mouse_freezer import MouseFreezer
+from src.mouse_hider.backends.confine import FakeConfineBackend
+from src.mouse_hider.backends.focus import FakeFocusBackend
+from src.mouse_hider.backends.keyboard import FakeKeyboardBackend
+from src.mouse_hider.backends.mouse import FakeMouseBackend
+
+# field -> (new value, hook installs, rebinds)
+EXPECTED = {
+    "FROZEN_COORDS": ([101, 202], 0, 0),
+    "UNFROZEN_COORDS": ([303, 404], 0, 0),
+    "GAME_EXE_NAME": ("Other.exe", 0, 0),
+    "POSITION_SAFETY_INTERVAL": (0.25, 0, 0),
+    "HOTKEY_SC": (79, 0, 1),
+    "SPACE_HOTKEY_SC": (58, 0, 1),
+}
+
+
+def run() -> dict:
+    SingletonMeta._instances.pop(Config, None)
+    FocusWatcher._instance = None
+    MouseFreezer._instance = None
+    KeyboardDispatcher._instance = None
+    config = load_config()
+    mouse = FakeMouseBackend()
+    components = _build(focus_backend=FakeFocusBackend(),
+                        keyboard_backend=FakeKeyboardBackend(),
+                        mouse_backend=mouse,
+                        confine_backend=FakeConfineBackend(mouse))
+    hooks = REGISTRY.counter("hotkey.hooks_installed")
+    rebinds = REGISTRY.counter("hotkey.rebinds")
+    results = {}
+    try:
+        for name, (value, _, _) in EXPECTED.items():
+            hooks0, rebinds0 = hooks.value, rebinds.value
+            setattr(config, name, value)
+            results[name] = (hooks.value - hooks0, rebinds.value - rebinds0)
+    finally:
+        components.teardown()
+    return results
+
+
+def main():
+    results = run()
+    failed = False
+    print(f"{'field':<26} {'hooks':>6} {'rebinds':>8}")
+    for name, (hooks, rebinds) in results.items():
+        want = EXPECTED[name][1:]
+        mark = "" if (hooks, rebinds) == want else f"  expected {want[0]} / {want[1]}"
+        failed |= bool(mark)
+        print(f"{name:<26} {hooks:>6} {rebinds:>8}{mark}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
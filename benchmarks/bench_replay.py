@@ -0,0 +1,140 @@
+"""
+Replay an input trace through the real wiring against the fake backends.
+
+Traces are recorded with `python main.py --record PATH`; without one, a
+synthetic session (focus, toggles, cam-7, space remap, mouse movement) is
+generated. Reports events per second through the hook dispatch path and
+the resulting state, so a bug report's trace can be reproduced on Linux.
+The synthetic session exits with status 1 unless every round's Space
+became a right-click:
+
+    python -m benchmarks.bench_replay                  # synthetic, as fast as possible
+    python -m benchmarks.bench_replay session.trace    # a recorded trace
+    python -m benchmarks.bench_replay session.trace --speed 1   # real time
+"""
+import argparse
+import os
+import sys
+import time
+from time import perf_counter_ns
+
+from src.mouse_hider.metrics import REGISTRY
+from src.mouse_hider.trace import (FOCUS, KEY_PRESS, KEY_RELEASE, MOVE,
+                                   TraceEvent, read_trace, replay, write_trace)
+from benchmarks.bench_latency import GAME_PID, OTHER_PID, Harness, _wait_for
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SYNTHETIC_PATH = os.path.join(HERE, "results", "synthetic.trace")
+
+KEY_HOLD_US = 80_000
+MOVE_US = 8_000     # 125 Hz mouse
+
+
+def synthetic_session(config, rounds: int) -> list[TraceEvent]:
+    """A plausible session: each round toggles, moves the frozen mouse,
+    enters cam-7, holds space, leaves with Q, then alt-tabs away and back."""
+    events: list[TraceEvent] = []
+    t = 0
+
+    def add(kind, a, b=0, name=None, gap=KEY_HOLD_US):
+        nonlocal t
+        t += gap
+        events.append(TraceEvent(t, kind, a, b, name))
+
+    def tap(scan_code):
+        add(KEY_PRESS, scan_code)
+        add(KEY_RELEASE, scan_code)
+
+    x, y = config.FROZEN_COORDS
+    add(FOCUS, GAME_PID, name=config.GAME_EXE_NAME)
+    for _ in range(rounds):
+        tap(config.HOTKEY_SC)
+        for i in range(50):
+            add(MOVE, x + i % 7, y - i % 5, gap=MOVE_US)
+        tap(config.DEACTIVATION_HOTKEY_SC)
+        add(KEY_PRESS, config.SPACE_HOTKEY_SC)
+        for _ in range(10):     # auto-repeat while held
+            add(KEY_PRESS, config.SPACE_HOTKEY_SC, gap=30_000)
+        add(KEY_RELEASE, config.SPACE_HOTKEY_SC)
+        tap(config.Q_SCAN_CODE)
+        tap(config.HOTKEY_SC)
+        add(FOCUS, OTHER_PID, name="explorer.exe")
+        add(FOCUS, GAME_PID, name=config.GAME_EXE_NAME)
+    return events
+
+
+def run(events: list[TraceEvent], speed: float) -> dict:
+    harness = Harness()
+    harness.start()
+    try:
+        queue_delay = REGISTRY.histogram("input.queue_delay")
+        queued_before = queue_delay.count
+        t0 = perf_counter_ns()
+        watcher = harness.watcher
+
+        def _settle(event):
+            # a real alt-tab is never followed by a key within microseconds
+            focused = (event.name or "").lower() in watcher.profiles
+            _wait_for(lambda: watcher.game_focused == focused, perf_counter_ns())
+
+        sent = replay(events, harness.keyboard, harness.mouse, harness.focus, speed,
+                      on_focus=None if speed else _settle)
+        elapsed_s = (perf_counter_ns() - t0) / 1e9
+        # let the state machine drain its queue
+        seen = -1
+        while queue_delay.count != seen:
+            seen = queue_delay.count
+            time.sleep(0.05)
+        return {
+            "events": sent,
+            "elapsed_s": elapsed_s,
+            "events_per_s": sent / elapsed_s if elapsed_s else 0.0,
+            "state_inputs": queue_delay.count - queued_before,
+            "queue_delay": queue_delay.snapshot(),
+            "frozen": harness.freezer.freeze_flag,
+            "buttons": sorted(harness.mouse.pressed),
+            "button_presses": harness.mouse.presses,
+            "cursor": harness.mouse.position,
+            "game_focused": harness.watcher.game_focused,
+        }
+    finally:
+        harness.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("trace", nargs="?", help="trace file (default: synthetic)")
+    parser.add_argument("--speed", type=float, default=0.0,
+                        help="1 = recorded timing, 0 = as fast as possible (default)")
+    parser.add_argument("--rounds", type=int, default=200,
+                        help="rounds in the synthetic session")
+    args = parser.parse_args()
+
+    if args.trace:
+        started_ns, events = read_trace(args.trace)
+        print(f"{args.trace}: {len(events)} events recorded "
+              f"{time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(started_ns / 1e9))}")
+    else:
+        from src.mouse_hider.config import load_config
+        os.makedirs(os.path.dirname(SYNTHETIC_PATH), exist_ok=True)
+        write_trace(SYNTHETIC_PATH, synthetic_session(load_config(), args.rounds))
+        _, events = read_trace(SYNTHETIC_PATH)
+        print(f"synthetic: {len(events)} events ({os.path.getsize(SYNTHETIC_PATH)} bytes)")
+
+    r = run(events, args.speed)
+    q = r["queue_delay"]
+    print(f"replayed {r['events']} events in {r['elapsed_s'] * 1e3:.1f} ms "
+          f"({r['events_per_s']:,.0f} events/s)")
+    print(f"state machine: {r['state_inputs']} inputs, queue delay "
+          f"p50 {q['p50_us']:.1f} us  p99 {q['p99_us']:.1f} us  max {q['max_us']:.1f} us")
+    print(f"final state: frozen={r['frozen']} buttons={r['buttons']} "
+          f"cursor={r['cursor']} game_focused={r['game_focused']}")
+    print(f"right-clicks from the space remap: {r['button_presses']}")
+    if not args.trace and r["button_presses"] != args.rounds:
+        print(f"FAIL expected one per round ({args.rounds})")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
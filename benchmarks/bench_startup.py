@@ -0,0 +1,99 @@
+"""
+Time to ready and resident memory: GUI mode vs `--headless`.
+
+Launches `main.py` as a child process once per mode and waits for the
+startup report that the launcher logs once it is up. It then samples the
+child's RSS after a short settle period and kills the child. The real
+runtime dependencies are needed (PySide6 for the GUI mode, psutil for
+RSS). Run from the repo root:
+
+    python -m benchmarks.bench_startup [runs]
+"""
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+from threading import Event, Thread
+
+import psutil
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+RESULTS_PATH = os.path.join(HERE, "results", "startup.json")
+
+MODES = {
+    "gui": [],
+    "headless": ["--headless"],
+    "headless_asyncio": ["--headless", "--asyncio"],
+}
+READY_TIMEOUT_S = 30.0
+SETTLE_S = 1.0          # let lazy work finish before sampling RSS
+
+_READY_RE = re.compile(r"Startup: ready at ([\d.]+) ms")
+
+
+def _launch(args: list[str]) -> dict:
+    t0 = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "main.py", *args], cwd=ROOT,
+        stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    ready = Event()
+    found: dict = {}
+
+    def _read():
+        for line in proc.stderr:
+            match = _READY_RE.search(line)
+            if match and not ready.is_set():
+                found["wall_ms"] = (time.perf_counter() - t0) * 1e3
+                found["ready_ms"] = float(match.group(1))
+                ready.set()
+            found["last_line"] = line.strip()
+        ready.set()             # child exited before it was ready
+
+    Thread(target=_read, daemon=True).start()
+    try:
+        if not ready.wait(READY_TIMEOUT_S) or "ready_ms" not in found:
+            raise RuntimeError(f"no startup report: {found.get('last_line', '')}")
+        time.sleep(SETTLE_S)
+        found["rss_mb"] = psutil.Process(proc.pid).memory_info().rss / 2**20
+        return found
+    finally:
+        proc.kill()
+        proc.wait()
+
+
+def run(runs: int) -> dict:
+    results = {}
+    for mode, args in MODES.items():
+        try:
+            samples = [_launch(args) for _ in range(runs)]
+        except RuntimeError as e:
+            results[mode] = {"error": str(e)}
+            continue
+        results[mode] = {
+            key: statistics.median(s[key] for s in samples)
+            for key in ("wall_ms", "ready_ms", "rss_mb")
+        }
+    return results
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    results = run(runs)
+    print(f"{'mode':<18} {'launch→ready ms':>16} {'in-process ms':>14} {'RSS MB':>8}")
+    for mode, r in results.items():
+        if "error" in r:
+            print(f"{mode:<18} unavailable: {r['error']}")
+            continue
+        print(f"{mode:<18} {r['wall_ms']:>16.1f} {r['ready_ms']:>14.1f} {r['rss_mb']:>8.1f}")
+
+    os.makedirs(os.path.dirname(RESULTS_PATH), exist_ok=True)
+    with open(RESULTS_PATH, "w") as f:
+        json.dump(results, f, indent=4)
+
+
+if __name__ == "__main__":
+    main()
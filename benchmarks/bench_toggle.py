@@ -0,0 +1,73 @@
+"""
+Freeze / unfreeze latency of MouseFreezer per mouse backend.
+
+"pynput_per_freeze" starts and stops a suppressing listener thread on
+every toggle (the old behaviour); "pynput_persistent" keeps one listener
+installed and only flips its suppression flag. The pynput rows need a
+desktop session (real hooks; Windows for the persistent listener) and
+are skipped when pynput cannot be imported. Run from the repo root:
+
+    python -m benchmarks.bench_toggle [toggles]
+"""
+import sys
+from time import perf_counter_ns
+
+from src.mouse_hider.config import load_config
+from src.mouse_hider.mouse_freezer import MouseFreezer
+from src.mouse_hider.backends.mouse import FakeMouseBackend
+
+
+def _backends() -> dict:
+    backends = {"fake": FakeMouseBackend}
+    try:
+        from src.mouse_hider.backends.mouse import PynputMouseBackend
+        import pynput  # noqa: F401
+    except ImportError as e:
+        print(f"skipping pynput backends: {e}")
+        return backends
+    backends["pynput_per_freeze"] = lambda: PynputMouseBackend(persistent=False)
+    if sys.platform == "win32":
+        backends["pynput_persistent"] = lambda: PynputMouseBackend(persistent=True)
+    return backends
+
+
+def _percentile(values: list[int], q: float) -> float:
+    return values[min(len(values) - 1, round(q * (len(values) - 1)))] / 1e3
+
+
+def run(toggles: int) -> dict:
+    config = load_config()
+    config.POSITION_MODE = "event"      # time the hook, not the cursor clip
+    results = {}
+    for name, make in _backends().items():
+        MouseFreezer._instance = None
+        freezer = MouseFreezer(mouse=make())
+        freezer.start()
+        freeze_ns, unfreeze_ns = [], []
+        try:
+            for _ in range(toggles):
+                t0 = perf_counter_ns()
+                freezer.freeze()
+                t1 = perf_counter_ns()
+                freezer.unfreeze()
+                t2 = perf_counter_ns()
+                freeze_ns.append(t1 - t0)
+                unfreeze_ns.append(t2 - t1)
+        finally:
+            freezer.stop()
+        results[name] = {"freeze": sorted(freeze_ns), "unfreeze": sorted(unfreeze_ns)}
+    return results
+
+
+def main():
+    toggles = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    results = run(toggles)
+    print(f"{'backend':<20} {'op':<9} {'p50 us':>9} {'p99 us':>9} {'max us':>9}")
+    for name, ops in results.items():
+        for op, values in ops.items():
+            print(f"{name:<20} {op:<9} {_percentile(values, 0.5):>9.1f} "
+                  f"{_percentile(values, 0.99):>9.1f} {values[-1] / 1e3:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Time for the hook watchdog to notice and repair a dropped hook.
+
+Runs the real wiring against the fake backends with a short
+HOOK_WATCHDOG_INTERVAL, then makes the fake keyboard and focus backends
+lose their OS hook the way Windows silently removes one (the callbacks
+stay registered, nothing is delivered). Exits with status 1 unless each
+hook is reinstalled and works again. Run from the repo root:
+
+    python -m benchmarks.bench_watchdog [interval-seconds]
+"""
+import sys
+import time
+
+from src.mouse_hider.metrics import REGISTRY
+from benchmarks.bench_latency import OTHER_PID, Harness, _wait_for
+
+
+def _repair_time(harness: Harness, name: str, timeout_s: float) -> float:
+    counter = REGISTRY.counter(f"watchdog.{name}.reinstalls")
+    before = counter.value
+    t0 = time.perf_counter_ns()
+    deadline = t0 + int(timeout_s * 1e9)
+    while counter.value == before:
+        if time.perf_counter_ns() > deadline:
+            raise TimeoutError(f"{name} hook not reinstalled within {timeout_s:.1f}s")
+        time.sleep(0.001)
+    return (time.perf_counter_ns() - t0) / 1e9
+
+
+def run(interval: float) -> dict:
+    harness = Harness()
+    harness.config.HOOK_WATCHDOG_INTERVAL = interval
+    harness.start()
+    timeout_s = 4 * interval + 1
+    try:
+        harness.toggle()
+
+        harness.keyboard.drop_hooks()
+        frozen = harness.freezer.freeze_flag
+        harness.keyboard.press(harness.config.HOTKEY_SC)
+        harness.keyboard.release(harness.config.HOTKEY_SC)
+        time.sleep(0.05)
+        keyboard_dead = harness.freezer.freeze_flag == frozen
+        keyboard_s = _repair_time(harness, "keyboard", timeout_s)
+        harness.toggle()            # raises TimeoutError if still dead
+
+        harness.focus.drop_hook()
+        harness.focus.set_foreground(OTHER_PID, "explorer.exe")
+        time.sleep(0.05)
+        focus_dead = harness.watcher.game_focused
+        focus_s = _repair_time(harness, "focus", timeout_s)
+        _wait_for(lambda: not harness.watcher.game_focused, time.perf_counter_ns())
+    finally:
+        harness.stop()
+    return {
+        "keyboard": {"dropped": keyboard_dead, "repair_s": keyboard_s,
+                     "os_installs": harness.keyboard.installs},
+        "focus": {"dropped": focus_dead, "repair_s": focus_s},
+    }
+
+
+def main():
+    interval = float(sys.argv[1]) if len(sys.argv) > 1 else 0.1
+    try:
+        results = run(interval)
+    except TimeoutError as e:
+        print(f"FAIL {e}")
+        return 1
+    for name, r in results.items():
+        print(f"{name:<9} dropped={r['dropped']} repaired in {r['repair_s'] * 1e3:.0f} ms "
+              f"(interval {interval * 1e3:.0f} ms)")
+    print(f"keyboard OS hook installs: {results['keyboard']['os_installs']}")
+    return 0 if all(r["dropped"] for r in results.values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,29 +3,42 @@
 Mouse-Hider launcher with self-re-exec support.
 
 Adds a “Restart” tray-menu item that relaunches the program and exits cleanly.
+Input hooks are armed before PySide6 is imported; the startup timing report
+is logged once the tray icon is up. `--headless` skips Qt entirely.
+`--record PATH` writes the input events to a trace file for
+benchmarks/bench_replay.py; only bound hotkeys pressed while the game has
+focus are recorded.
 """
+from time import perf_counter_ns
+_LAUNCHED_NS = perf_counter_ns()
+
 import os
 import sys
+import time
+import atexit
+import argparse
 import subprocess
 import logging
-from threading import Thread, Event
+from threading import Event
+from typing import TYPE_CHECKING
+
+from src.mouse_hider.startup import PROFILER
+PROFILER.install(_LAUNCHED_NS)
+
+from src.mouse_hider.log import setup_logging
 
-from PySide6.QtCore    import QTimer
-from PySide6.QtWidgets import QApplication
+from src.mouse_hider.config import Config, load_config, save_config, flush_config
+from src.mouse_hider.runtime import AsyncRuntime, ThreadRuntime
 
-from src.mouse_hider.config import Config, load_config, save_config
-from src.mouse_hider.gui.main_window import MainWindow
-from src.mouse_hider       import main as background_main
+if TYPE_CHECKING:
+    from PySide6.QtWidgets import QApplication
+
+HOOKS_READY_TIMEOUT = 5.0   # seconds to wait for the hooks before starting Qt
 
 
 # ───────── logging ─────────
-logging.basicConfig(
-    level=logging.DEBUG,
-    format="%(asctime)s %(levelname)s %(name)s: %(message)s",
-    datefmt="%H:%M:%S",
-    #filename="run.log",
-    #filemode="a",
-)
+# records are formatted on a background thread; run.log rotates by size
+setup_logging(logging.DEBUG, log_file="run.log")
 
 def restart_scheduled_task(task_path: str) -> None:
     """
@@ -51,10 +64,22 @@ def restart_scheduled_task(task_path: str) -> None:
     )
     print(f"Task {task_path!r} restarted. schtasks output:\n{result.stdout.strip()}")
 
-# ───────── helper: spawn new instance & exit this one ─────────
-def _restart_self(app: QApplication, stop_event: Event) -> None:
+# ───────── helper: restart in place, or re-launch as a fallback ─────────
+def _hot_restart(app: "QApplication", runtime) -> float | None:
+    """Rebuild the hooks, freezer and focus watcher in this process."""
+    logging.info("Restart requested – rebuilding in place …")
+    try:
+        return runtime.restart()
+    except Exception:
+        logging.exception("Hot restart failed – re-launching instead")
+        _restart_self(app, runtime.stop)
+        return None
+
+
+def _restart_self(app: "QApplication", stop_worker) -> None:
     """Launch a new copy of this program, then shut down gracefully."""
     logging.info("Restart requested – spawning replacement instance …")
+    flush_config()
     restart_scheduled_task(r"\MyTasks\Hide Mouse")
     """ python = sys.executable
     script = os.path.abspath(sys.argv[0])
@@ -68,33 +93,101 @@ def _restart_self(app: QApplication, stop_event: Event) -> None:
         creationflags=flags,
     ) """
 
-    # Tell the worker thread to finish and close the GUI after the event loop ticks
-    stop_event.set()
+    from PySide6.QtCore import QTimer
+
+    # Tell the worker to finish and close the GUI after the event loop ticks
+    stop_worker()
     QTimer.singleShot(0, app.quit)   # quit as soon as control returns
 
 
-# ───────── main block ─────────
-if __name__ == "__main__":
-    # --- load & watch config ----------------------------------
-    config: Config = load_config()
-    config.add_callback(save_config)
-
-    # --- background worker thread -----------------------------
-    stop_event = Event()
-    worker = Thread(
-        target=background_main,      # long-running function
-        args=(stop_event,),
-        daemon=True
-    )
-    worker.start()
+# ───────── background runtime ─────────
+def _start_background(use_asyncio: bool, backends: dict):
+    """Start hooks, freezer and focus watcher on a background runtime:
+    one asyncio loop thread, or the classic worker thread."""
+    runtime = AsyncRuntime(**backends) if use_asyncio else ThreadRuntime(**backends)
+    runtime.start()
+    return runtime
+
+
+def _wait_for_hooks(hooks_ready: Event) -> None:
+    with PROFILER.phase("wait for hooks"):
+        if not hooks_ready.wait(HOOKS_READY_TIMEOUT):
+            logging.warning("Hooks not ready after %.0fs; continuing anyway",
+                            HOOKS_READY_TIMEOUT)
+
+
+# ───────── headless: no Qt at all ─────────
+def run_headless(use_asyncio: bool, backends: dict) -> int:
+    runtime = _start_background(use_asyncio, backends)
+    _wait_for_hooks(runtime.hooks_ready)
+    PROFILER.finish()
+    PROFILER.log_report()
+    try:
+        # sleep rather than join: a join interrupted by Ctrl+C can leave
+        # the thread looking finished while it is still running
+        while runtime.is_alive():
+            time.sleep(0.5)
+    except KeyboardInterrupt:
+        logging.info("Interrupted – shutting down")
+    finally:
+        runtime.stop(2)
+        flush_config()
+    return 0
+
+
+# ───────── GUI: tray icon + config window ─────────
+def run_gui(use_asyncio: bool, backends: dict) -> int:
+    runtime = _start_background(use_asyncio, backends)
+    # hooks first: the GUI imports would otherwise compete for the GIL
+    _wait_for_hooks(runtime.hooks_ready)
 
     # --- Qt application ---------------------------------------
-    app = QApplication(sys.argv)
-    app.setQuitOnLastWindowClosed(False)
-    app.aboutToQuit.connect(stop_event.set)   # ensure worker stops on exit
+    with PROFILER.phase("import Qt + GUI"):
+        from PySide6.QtWidgets import QApplication
+        from src.mouse_hider.gui.main_window import MainWindow
+
+    with PROFILER.phase("build GUI"):
+        app = QApplication(sys.argv)
+        app.setQuitOnLastWindowClosed(False)
+        app.aboutToQuit.connect(runtime.stop)     # ensure worker stops on exit
+        app.aboutToQuit.connect(flush_config)     # write any debounced config change
+
+        # Pass restart callback to the window/tray
+        window = MainWindow(restart_callback=lambda: _hot_restart(app, runtime))
+        window.show()
+    PROFILER.finish()
+    PROFILER.log_report()
+
+    return app.exec()
 
-    # Pass restart callback to the window/tray
-    window = MainWindow(restart_callback=lambda: _restart_self(app, stop_event))
-    window.show()
 
-    sys.exit(app.exec())
+# ───────── main block ─────────
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Mouse Hider")
+    parser.add_argument("--asyncio", action="store_true",
+                        help="run the background logic as asyncio tasks on one thread")
+    parser.add_argument("--headless", action="store_true",
+                        help="run only the hooks, freezer and focus watcher; "
+                             "no tray icon and no PySide6 import")
+    parser.add_argument("--record", metavar="PATH",
+                        help="record hotkey, mouse and focus events to a trace file; "
+                             "keys are recorded only while the game has focus and "
+                             "only if bound to a hotkey (other typing is never "
+                             "written), so a trace cannot replay them")
+    args = parser.parse_args()
+
+    # --- load & watch config ----------------------------------
+    with PROFILER.phase("config"):
+        config: Config = load_config()
+        config.add_batch_callback(save_config)
+
+    backends = {}
+    if args.record:
+        from src.mouse_hider.trace import TraceWriter, recording_backends
+        trace_writer = TraceWriter(args.record)
+        atexit.register(trace_writer.close)
+        backends = recording_backends(trace_writer)
+
+    if args.headless:
+        sys.exit(run_headless(args.asyncio, backends))
+    sys.exit(run_gui(args.asyncio, backends))
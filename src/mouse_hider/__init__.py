@@ -1,127 +1,222 @@
 import logging
-from time import sleep
+from dataclasses import dataclass, field
 from threading import Event
-
-from pynput.mouse import Button
+from typing import Callable
 
 from .focus_watcher import FocusWatcher
 from .mouse_freezer import MouseFreezer
-from .hotkey_handler import HotkeyHandler
-from .config import Config
+from .hotkey_handler import HotkeyHandler, KeyboardDispatcher
+from .config import Config, config_writer
+from .config_watch import ConfigFileWatcher
+from .input_state import Input, InputStateMachine
+from .profiles import COORD_FIELDS, compile_profiles
+from .scheduler import Scheduler
+from .startup import PROFILER
+from .watchdog import HookWatchdog
+from .backends.confine import ConfineBackend
+from .backends.focus import FocusBackend
+from .backends.keyboard import KeyboardBackend
+from .backends.mouse import MouseBackend
 
 logger = logging.getLogger(__name__)
 shutdown_flag = False
 
 
-def update_all_configs(config, field, old, new):
-    FocusWatcher().update_config()
-    MouseFreezer().update_config()
-    HotkeyHandler().update_config()
-
-
-def main(stop_event: Event | None = None):
+@dataclass
+class _Components:
+    freezer: MouseFreezer
+    focus_watcher: FocusWatcher
+    machine: InputStateMachine
+    watchdog: HookWatchdog
+    config_watcher: ConfigFileWatcher
+    handlers: list[HotkeyHandler]
+    callbacks: list[Callable] = field(default_factory=list)    # on Config
+
+    def teardown(self):
+        """Release the hooks and forget the singletons so _build() can run
+        again in this process. Worker threads and tasks are stopped by the
+        caller."""
+        self.watchdog.stop()
+        self.config_watcher.stop()
+        for handler in self.handlers:
+            handler.stop()
+        KeyboardDispatcher().stop()
+        self.freezer.unfreeze()
+        self.freezer.stop()
+        config = Config()
+        for callback in self.callbacks:
+            config.remove_callback(callback)
+        FocusWatcher._instance = None
+        MouseFreezer._instance = None
+        KeyboardDispatcher._instance = None
+
+
+def _build(focus_backend: FocusBackend | None = None,
+           keyboard_backend: KeyboardBackend | None = None,
+           mouse_backend: MouseBackend | None = None,
+           confine_backend: ConfineBackend | None = None):
+    """Wire up the components; backends default to the real OS hooks."""
     config = Config()
-    freezer = MouseFreezer()
+    freezer = MouseFreezer(mouse=mouse_backend, confine=confine_backend)
+    machine = InputStateMachine(freezer, is_focused=lambda: focus_watcher.game_focused)
     # On focus loss, auto‑unfreeze
     focus_watcher = FocusWatcher(
         on_gain=lambda: None,
-        on_loss=freezer.unfreeze
+        on_loss=lambda: machine.post(Input.FOCUS_LOSS),
+        backend=focus_backend,
+        on_switch=lambda profile: _use_profile(profile)
     )
 
-    cam_7_mode = False            # already there
-    space_translated_down = False # NEW ➊  – did we turn Space into a right-click?
-    space_physically_down = False # NEW ➋  – is the key itself still down?
-
+    # hook callbacks only decide suppression and enqueue; the state
+    # machine's thread does the actual work
     def _on_space_press(event):
-        nonlocal space_translated_down, space_physically_down   # ← here
-        space_physically_down = True
-        if focus_watcher.game_focused and cam_7_mode:
-            freezer.mouse.press(Button.right)
-            space_translated_down = True
-            return False        # swallow Space
-        return True
+        return machine.on_space_press()
 
     def _on_space_release(event):
-        nonlocal space_translated_down, space_physically_down   # ← here
-        space_physically_down = False
-        if space_translated_down:
-            freezer.mouse.release(Button.right)
-            space_translated_down = False
-            return False
-        return True
+        return machine.on_space_release()
 
     def _on_hotkey(event):        # leaves cam-7 mode
-        nonlocal cam_7_mode, space_translated_down              # ← here
-        if focus_watcher.game_focused:
-            freezer.toggle()
-            cam_7_mode = False
-            if space_translated_down:          # key still held → release
-                freezer.mouse.release(Button.right)
-                space_translated_down = False
+        machine.on_key(Input.TOGGLE)
 
     def _on_deactivation_hotkey(event):   # enters cam-7 mode
-        nonlocal cam_7_mode                                     # ← here
-        if focus_watcher.game_focused:
-            freezer.unfreeze()
-            cam_7_mode = True
-            
+        machine.on_key(Input.ENTER_CAM7)
+
     def _on_q_or_e(event):
-        nonlocal cam_7_mode, space_translated_down, space_physically_down
-        if focus_watcher.game_focused:
-            cam_7_mode = False
-            freezer.freeze()
-            if space_translated_down:          # key still held → release
-                freezer.mouse.release(Button.right)
-                space_translated_down = False
-            if space_physically_down:          # key itself still down → release
-                freezer.mouse.release(Button.right)
-                space_physically_down = False
+        machine.on_key(Input.EXIT_CAM7)
 
     activation_handler = HotkeyHandler(
         hotkey="HOTKEY_SC",
         on_press=_on_hotkey,
-        on_release=lambda _: None
+        on_release=lambda _: None,
+        backend=keyboard_backend
     )
     deactivation_handler = HotkeyHandler(
         hotkey="DEACTIVATION_HOTKEY_SC",
         on_press=_on_deactivation_hotkey,
-        on_release=lambda _: None
+        on_release=lambda _: None,
+        backend=keyboard_backend
     )
     space_handler = HotkeyHandler(
         hotkey="SPACE_HOTKEY_SC",
         on_press=_on_space_press,
-        on_release=_on_space_release
+        on_release=_on_space_release,
+        backend=keyboard_backend,
+        suppress=True
     )
     q_handler = HotkeyHandler(
         hotkey="Q_SCAN_CODE",
         on_press=_on_q_or_e,
-        on_release=lambda _: None
+        on_release=lambda _: None,
+        backend=keyboard_backend
     )
     e_handler = HotkeyHandler(
         hotkey="E_SCAN_CODE",
         on_press=_on_q_or_e,
-        on_release=lambda _: None
+        on_release=lambda _: None,
+        backend=keyboard_backend
     )
 
-    def update_all_configs(config, field, old, new):
-        FocusWatcher().update_config()
-        MouseFreezer().update_config()
-        activation_handler.update_config()
-        deactivation_handler.update_config()
+    # reinstalls a hook that stops delivering events
+    watchdog = HookWatchdog()
+    watchdog.watch("keyboard", activation_handler.dispatcher, user_input=True)
+    watchdog.watch("mouse", freezer.mouse, user_input=True)
+    watchdog.watch("focus", focus_watcher)
+
+    components = _Components(
+        freezer, focus_watcher, machine, watchdog, ConfigFileWatcher(),
+        [activation_handler, deactivation_handler, space_handler, q_handler, e_handler])
+
+    # each component reloads only when a field it uses changes
+    def _subscribe(callback, fields):
+        config.add_batch_callback(callback, fields=fields)
+        components.callbacks.append(callback)
+
+    for handler in components.handlers:
+        _subscribe(lambda *_, h=handler: h.update_config(), (handler.hotkey,))
 
-    config.add_callback(update_all_configs)
+    # profiles are compiled up front, one hotkey table each; a focus change
+    # to another game only swaps references
+    dispatcher = activation_handler.dispatcher
+    _subscribe(lambda *_: dispatcher.update_config(), ("HOOK_BUDGET_MS",))
+
+    def _use_profile(profile):
+        freezer.use_profile(profile)
+        dispatcher.use_profile(profile)
+
+    def _recompile(*_):
+        profiles = compile_profiles(config.snapshot)
+        dispatcher.compile(profiles.values())
+        focus_watcher.set_profiles(profiles)
+
+    _recompile()
+    _subscribe(_recompile, ("GAME_EXE_NAME", "PROFILES") + COORD_FIELDS)
 
     logger.info(
-        f"Ready. NumPad / toggles freeze (only while {config.GAME_EXE_NAME} runs).")
+        f"Ready. NumPad / toggles freeze (only while {' / '.join(focus_watcher.profiles)} runs).")
     logger.info(
         f"Frozen → {config.FROZEN_COORDS} | Unfrozen → {config.UNFROZEN_COORDS}")
     logger.info("Exit with Ctrl+C.")
-    freezer.start()
-    focus_watcher.start()
+    return components
+
+
+def _ready(ready_event: Event | None):
+    PROFILER.mark("ready")
+    if ready_event is not None:
+        ready_event.set()
+
+
+def main(stop_event: Event | None = None, ready_event: Event | None = None,
+         **backends):
+    """Thread runtime. `backends` are passed to _build(); benchmarks pass fakes.
+    `ready_event` is set once the hooks are live."""
+    with PROFILER.phase("build (hooks armed)"):
+        components = _build(**backends)
+    with PROFILER.phase("start workers"):
+        components.machine.start()
+        components.freezer.start()
+        components.focus_watcher.start()
+        components.watchdog.start()
+        components.config_watcher.start()
+        Scheduler().start()
+    _ready(ready_event)
+    stop_event = stop_event or Event()
+    try:
+        # run until Ctrl‑C *or* GUI tells us to stop; the timeout keeps
+        # Ctrl‑C deliverable on Windows
+        while not stop_event.wait(1):
+            pass
+    finally:
+        components.machine.stop()
+        components.focus_watcher.stop()
+        logger.info("Scheduler stats: %s", Scheduler().stats())
+        components.teardown()   # always clean up
+        logger.info("Stopped.")
+
+
+async def main_async(ready_event: Event | None = None, **backends):
+    """Asyncio runtime: the focus watcher, scheduler (cursor keeper), config
+    writer and input state machine run as tasks on the current loop until
+    this coroutine is cancelled."""
+    import asyncio     # imported here so the thread runtime never loads it
+    with PROFILER.phase("build (hooks armed)"):
+        components = _build(**backends)
+    components.freezer.start()
+    components.watchdog.start()
+    components.config_watcher.start()
+    tasks = [
+        asyncio.create_task(components.machine.run_async(), name="input"),
+        asyncio.create_task(components.focus_watcher.run_async(), name="focus"),
+        asyncio.create_task(Scheduler().run_async(), name="scheduler"),
+        asyncio.create_task(config_writer.run_async(), name="config-writer"),
+    ]
+    await asyncio.sleep(0)      # let the tasks start their backends
+    _ready(ready_event)
     try:
-        # run until Ctrl‑C *or* GUI tells us to stop
-        while stop_event is None or not stop_event.is_set():
-            sleep(1)
+        await asyncio.gather(*tasks)
     finally:
-        freezer.unfreeze()      # always clean up
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        logger.info("Scheduler stats: %s", Scheduler().stats())
+        components.teardown()   # always clean up
         logger.info("Stopped.")
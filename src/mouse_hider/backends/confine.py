@@ -0,0 +1,63 @@
+import logging
+import sys
+
+from .mouse import FakeMouseBackend
+
+logger = logging.getLogger(__name__)
+
+
+class ConfineBackend:
+    """Pins the cursor to one point at OS level, so nothing has to move it
+    back while frozen. confine() raises OSError if the OS refuses."""
+
+    def confine(self, x: int, y: int) -> None:
+        raise NotImplementedError
+
+    def release(self) -> None:
+        raise NotImplementedError
+
+
+class ClipCursorBackend(ConfineBackend):
+    """Win32 ClipCursor with a 1x1 rectangle.
+
+    Windows drops the clip when another window takes the foreground; the
+    freezer is unfrozen on focus loss anyway.
+    """
+
+    def confine(self, x: int, y: int) -> None:
+        import ctypes
+        from ctypes import wintypes
+
+        rect = wintypes.RECT(x, y, x + 1, y + 1)
+        if not ctypes.windll.user32.ClipCursor(ctypes.byref(rect)):
+            raise ctypes.WinError()
+
+    def release(self) -> None:
+        import ctypes
+        ctypes.windll.user32.ClipCursor(None)
+
+
+class FakeConfineBackend(ConfineBackend):
+    """Confines a FakeMouseBackend: user_move() leaves the cursor on the
+    clip point. `fail` makes confine() raise, to exercise the fallback."""
+
+    def __init__(self, mouse: FakeMouseBackend, fail: bool = False):
+        self.mouse = mouse
+        self.fail = fail
+        self.calls = 0
+
+    def confine(self, x: int, y: int) -> None:
+        self.calls += 1
+        if self.fail:
+            raise OSError("confinement unavailable")
+        self.mouse.clip = (x, y)
+
+    def release(self) -> None:
+        self.mouse.clip = None
+
+
+def default_confine_backend() -> ConfineBackend | None:
+    if sys.platform == "win32":
+        return ClipCursorBackend()
+    logger.info("No cursor confinement on %s; repositioning instead.", sys.platform)
+    return None
@@ -0,0 +1,220 @@
+import logging
+import sys
+import itertools
+import threading
+from typing import Callable
+
+logger = logging.getLogger(__name__)
+
+# on_change(pid) – pid of the process that owns the new foreground window
+FocusCallback = Callable[[int], None]
+
+EVENT_SYSTEM_FOREGROUND = 0x0003
+WINEVENT_OUTOFCONTEXT = 0x0000
+WM_QUIT = 0x0012
+
+
+class FocusBackend:
+    """Source of foreground-window changes, pushed to the FocusWatcher."""
+
+    def start(self, on_change: FocusCallback) -> None:
+        raise NotImplementedError
+
+    def stop(self) -> None:
+        raise NotImplementedError
+
+    def foreground_pid(self) -> int | None:
+        raise NotImplementedError
+
+    def process_name(self, pid: int) -> str | None:
+        import psutil
+        try:
+            return psutil.Process(pid).name()
+        except (psutil.Error, ValueError):
+            return None
+
+    def process_create_time(self, pid: int) -> float | None:
+        """Identity check for PID reuse; None once the process has exited."""
+        import psutil
+        try:
+            return psutil.Process(pid).create_time()
+        except (psutil.Error, ValueError):
+            return None
+
+
+def _win_foreground_pid() -> int | None:
+    import ctypes
+    from ctypes import wintypes
+
+    user32 = ctypes.windll.user32
+    user32.GetForegroundWindow.restype = wintypes.HWND
+    hwnd = user32.GetForegroundWindow()
+    if not hwnd:
+        return None
+    pid = wintypes.DWORD()
+    user32.GetWindowThreadProcessId(hwnd, ctypes.byref(pid))
+    return pid.value or None
+
+
+class WinEventFocusBackend(FocusBackend):
+    """Subscribes to EVENT_SYSTEM_FOREGROUND; the hook thread sleeps in
+    GetMessageW until Windows reports a foreground change."""
+
+    def __init__(self):
+        self._on_change: FocusCallback | None = None
+        self._thread: threading.Thread | None = None
+        self._thread_id = 0
+        self._ready = threading.Event()
+        self._error: OSError | None = None
+        self._proc = None       # keep the ctypes callback alive
+
+    def start(self, on_change: FocusCallback) -> None:
+        self._on_change = on_change
+        self._ready.clear()
+        self._error = None
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        self._ready.wait()
+        if self._error:
+            raise self._error
+        pid = self.foreground_pid()
+        if pid is not None:
+            on_change(pid)
+
+    def stop(self) -> None:
+        if self._thread and self._thread_id:
+            import ctypes
+            ctypes.windll.user32.PostThreadMessageW(self._thread_id, WM_QUIT, 0, 0)
+            self._thread.join(timeout=1)
+        self._thread = None
+        self._on_change = None
+
+    def foreground_pid(self) -> int | None:
+        return _win_foreground_pid()
+
+    def _run(self):
+        import ctypes
+        from ctypes import wintypes
+
+        user32 = ctypes.windll.user32
+        kernel32 = ctypes.windll.kernel32
+        WinEventProc = ctypes.WINFUNCTYPE(
+            None, wintypes.HANDLE, wintypes.DWORD, wintypes.HWND,
+            wintypes.LONG, wintypes.LONG, wintypes.DWORD, wintypes.DWORD)
+
+        def _callback(hook, event, hwnd, id_object, id_child, thread, time_ms):
+            pid = wintypes.DWORD()
+            user32.GetWindowThreadProcessId(hwnd, ctypes.byref(pid))
+            on_change = self._on_change
+            if pid.value and on_change:
+                on_change(pid.value)
+
+        self._proc = WinEventProc(_callback)
+        user32.SetWinEventHook.restype = wintypes.HANDLE
+        self._thread_id = kernel32.GetCurrentThreadId()
+        hook = user32.SetWinEventHook(
+            EVENT_SYSTEM_FOREGROUND, EVENT_SYSTEM_FOREGROUND,
+            0, self._proc, 0, 0, WINEVENT_OUTOFCONTEXT)
+        if not hook:
+            self._error = ctypes.WinError()
+            self._ready.set()
+            return
+        self._ready.set()
+        try:
+            msg = wintypes.MSG()
+            while user32.GetMessageW(ctypes.byref(msg), 0, 0, 0) > 0:
+                user32.TranslateMessage(ctypes.byref(msg))
+                user32.DispatchMessageW(ctypes.byref(msg))
+        finally:
+            user32.UnhookWinEvent(hook)
+            self._thread_id = 0
+
+
+class PollingFocusBackend(FocusBackend):
+    """Fallback when the WinEvent hook cannot be installed: polls the
+    foreground window on the shared Scheduler and only reports changes.
+    Polling backs off to `max_factor` x the interval while nothing changes."""
+
+    def __init__(self, interval: Callable[[], float], max_factor: float = 4.0):
+        self._interval = interval
+        self._max_factor = max_factor
+        self._job = None
+        self._last: int | None = None
+
+    def start(self, on_change: FocusCallback) -> None:
+        from ..scheduler import Scheduler
+
+        def _poll() -> bool:
+            pid = self.foreground_pid()
+            if pid is None or pid == self._last:
+                return False
+            self._last = pid
+            on_change(pid)
+            return True
+
+        self._last = None
+        self._job = Scheduler().register(
+            "focus.poll", _poll, self._interval,
+            max_interval=self._max_factor * self._interval())
+
+    def stop(self) -> None:
+        if self._job:
+            self._job.scheduler.unregister(self._job)
+            self._job = None
+
+    def foreground_pid(self) -> int | None:
+        return _win_foreground_pid()
+
+
+class FakeFocusBackend(FocusBackend):
+    """In-process backend for tests and benchmarks, driven by set_foreground().
+    `drop_hook()` simulates the OS silently removing the hook."""
+
+    def __init__(self):
+        self._names: dict[int, str] = {}
+        self._create_times: dict[int, float] = {}
+        self._clock = itertools.count(1)
+        self._pid: int | None = None
+        self._on_change: FocusCallback | None = None
+
+    def start(self, on_change: FocusCallback) -> None:
+        self._on_change = on_change
+        if self._pid is not None:
+            on_change(self._pid)
+
+    def stop(self) -> None:
+        self._on_change = None
+
+    def foreground_pid(self) -> int | None:
+        return self._pid
+
+    def process_name(self, pid: int) -> str | None:
+        return self._names.get(pid)
+
+    def process_create_time(self, pid: int) -> float | None:
+        return self._create_times.get(pid)
+
+    def set_foreground(self, pid: int, name: str | None = None) -> None:
+        if name is not None and self._names.get(pid) != name:
+            # a new name for a known pid models PID reuse
+            self._names[pid] = name
+            self._create_times[pid] = float(next(self._clock))
+        self._pid = pid
+        on_change = self._on_change
+        if on_change:
+            on_change(pid)
+
+    def drop_hook(self) -> None:
+        self._on_change = None
+
+    def exit_process(self, pid: int) -> None:
+        self._names.pop(pid, None)
+        self._create_times.pop(pid, None)
+
+
+def default_focus_backend() -> FocusBackend:
+    if sys.platform == "win32":
+        return WinEventFocusBackend()
+    logger.warning("No foreground-window API on %s; focus never changes.",
+                   sys.platform)
+    return FakeFocusBackend()
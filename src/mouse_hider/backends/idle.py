@@ -0,0 +1,29 @@
+import sys
+from time import monotonic_ns
+
+# GetTickCount advances in ~16 ms steps; report the earliest time the input
+# can have happened, so a hook that delivered it is never taken to have
+# missed it
+_TICK_SLACK_MS = 32
+
+
+def last_input_ns() -> int | None:
+    """monotonic_ns of the newest keyboard or mouse input the OS has seen,
+    from GetLastInputInfo; None off Windows or if the call fails.
+
+    This only reads a timestamp: unlike injected input it leaves the idle
+    timer (screensaver, lock, sleep) and other processes' hooks alone.
+    """
+    if sys.platform != "win32":
+        return None
+    import ctypes
+    from ctypes import wintypes
+
+    class LASTINPUTINFO(ctypes.Structure):
+        _fields_ = [("cbSize", wintypes.UINT), ("dwTime", wintypes.DWORD)]
+
+    info = LASTINPUTINFO(ctypes.sizeof(LASTINPUTINFO))
+    if not ctypes.windll.user32.GetLastInputInfo(ctypes.byref(info)):
+        return None
+    age_ms = (ctypes.windll.kernel32.GetTickCount() - info.dwTime) & 0xFFFFFFFF
+    return monotonic_ns() - (age_ms + _TICK_SLACK_MS) * 1_000_000
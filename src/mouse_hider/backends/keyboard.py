@@ -0,0 +1,252 @@
+import logging
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from time import monotonic_ns
+from typing import Callable
+
+from . import idle
+
+logger = logging.getLogger(__name__)
+
+KEY_DOWN = "down"
+KEY_UP = "up"
+
+WH_KEYBOARD_LL = 13
+HC_ACTION = 0
+WM_QUIT = 0x0012
+WM_KEYUP = 0x0101
+WM_SYSKEYUP = 0x0105
+
+# callback(event) -> bool; with suppress=True a False return blocks the key
+KeyCallback = Callable[[object], bool]
+Unhook = Callable[[], None]
+
+
+@dataclass
+class KeyEvent:
+    scan_code: int
+    event_type: str
+    name: str = ""
+    time: float = 0.0
+
+
+class KeyboardBackend:
+    """A global keyboard hook, mirroring `keyboard.hook`."""
+
+    def hook(self, callback: KeyCallback, suppress: bool = False) -> Unhook:
+        raise NotImplementedError
+
+    def probe(self) -> bool:
+        """Whether the hook watchdog can check this hook: it delivers every
+        key and last_input_ns() is known. Injects nothing."""
+        return False
+
+    def last_input_ns(self) -> int | None:
+        """monotonic_ns of the newest input the OS has seen; None if
+        unknown."""
+        return None
+
+    def reinstall(self) -> None:
+        """Remove the OS hook and install a new one, keeping the callbacks."""
+        raise NotImplementedError
+
+
+class KeyboardLibBackend(KeyboardBackend):
+    """The `keyboard` library installs its OS hook once and cannot
+    reinstall it, so this backend is not probed by the hook watchdog."""
+
+    def hook(self, callback, suppress=False):
+        import keyboard
+        return keyboard.hook(callback, suppress=suppress)
+
+
+class _CallbackList:
+    """The hooked callbacks, replaced on change so the hook thread can
+    iterate without a lock."""
+
+    def __init__(self):
+        self.entries: tuple[tuple[KeyCallback, bool], ...] = ()
+
+    def add(self, callback: KeyCallback, suppress: bool) -> Callable[[], bool]:
+        """Returns a remover, which reports whether any callback is left."""
+        entry = (callback, suppress)
+        self.entries += (entry,)
+
+        def _remove() -> bool:
+            self.entries = tuple(e for e in self.entries if e is not entry)
+            return bool(self.entries)
+        return _remove
+
+    def deliver(self, event) -> bool:
+        delivered = True
+        for callback, suppress in self.entries:
+            if not callback(event) and suppress:
+                delivered = False
+        return delivered
+
+
+class Win32KeyboardBackend(KeyboardBackend):
+    """Owns a WH_KEYBOARD_LL hook; its thread sleeps in GetMessageW, which
+    is where Windows calls the hook.
+
+    Windows removes a low-level hook whose callback keeps exceeding
+    LowLevelHooksTimeout, without telling the process. reinstall() stops
+    the hook thread and installs a fresh hook on a new one.
+    """
+
+    def __init__(self):
+        self._callbacks = _CallbackList()
+        self._thread: threading.Thread | None = None
+        self._thread_id = 0
+        self._ready = threading.Event()
+        self._error: OSError | None = None
+        self._proc = None       # keep the ctypes callback alive
+
+    def hook(self, callback, suppress=False):
+        remove = self._callbacks.add(callback, suppress)
+        if self._thread is None:
+            self._start()
+
+        def _unhook():
+            if not remove():
+                self._stop()
+        return _unhook
+
+    def probe(self):
+        return self._thread is not None
+
+    def last_input_ns(self):
+        return idle.last_input_ns()
+
+    def reinstall(self):
+        self._stop()
+        self._start()
+
+    def _start(self):
+        self._ready.clear()
+        self._error = None
+        self._thread = threading.Thread(target=self._run, name="keyboard-hook",
+                                        daemon=True)
+        self._thread.start()
+        self._ready.wait()
+        if self._error:
+            self._thread = None
+            raise self._error
+
+    def _stop(self):
+        if self._thread and self._thread_id:
+            import ctypes
+            ctypes.windll.user32.PostThreadMessageW(self._thread_id, WM_QUIT, 0, 0)
+            self._thread.join(timeout=1)
+        self._thread = None
+
+    def _run(self):
+        import ctypes
+        from ctypes import wintypes
+
+        class KBDLLHOOKSTRUCT(ctypes.Structure):
+            _fields_ = [("vkCode", wintypes.DWORD), ("scanCode", wintypes.DWORD),
+                        ("flags", wintypes.DWORD), ("time", wintypes.DWORD),
+                        ("dwExtraInfo", ctypes.c_size_t)]
+
+        user32 = ctypes.windll.user32
+        kernel32 = ctypes.windll.kernel32
+        LRESULT = ctypes.c_ssize_t
+        HookProc = ctypes.WINFUNCTYPE(LRESULT, ctypes.c_int, wintypes.WPARAM,
+                                      wintypes.LPARAM)
+        user32.SetWindowsHookExW.argtypes = (ctypes.c_int, HookProc,
+                                             wintypes.HINSTANCE, wintypes.DWORD)
+        user32.SetWindowsHookExW.restype = wintypes.HHOOK
+        user32.CallNextHookEx.argtypes = (wintypes.HHOOK, ctypes.c_int,
+                                          wintypes.WPARAM, wintypes.LPARAM)
+        user32.CallNextHookEx.restype = LRESULT
+        kernel32.GetModuleHandleW.restype = wintypes.HMODULE
+
+        def _callback(n_code, w_param, l_param):
+            if n_code == HC_ACTION:
+                info = ctypes.cast(l_param, ctypes.POINTER(KBDLLHOOKSTRUCT)).contents
+                event_type = KEY_UP if w_param in (WM_KEYUP, WM_SYSKEYUP) else KEY_DOWN
+                try:
+                    allow = self._callbacks.deliver(
+                        KeyEvent(info.scanCode, event_type, time=time.time()))
+                except Exception as e:
+                    logger.exception("Error in keyboard hook: %s", e)
+                    allow = True
+                if not allow:
+                    return 1
+            return user32.CallNextHookEx(None, n_code, w_param, l_param)
+
+        self._proc = HookProc(_callback)
+        self._thread_id = kernel32.GetCurrentThreadId()
+        hook = user32.SetWindowsHookExW(
+            WH_KEYBOARD_LL, self._proc, kernel32.GetModuleHandleW(None), 0)
+        if not hook:
+            self._error = ctypes.WinError()
+            self._ready.set()
+            return
+        self._ready.set()
+        try:
+            msg = wintypes.MSG()
+            while user32.GetMessageW(ctypes.byref(msg), 0, 0, 0) > 0:
+                user32.TranslateMessage(ctypes.byref(msg))
+                user32.DispatchMessageW(ctypes.byref(msg))
+        finally:
+            user32.UnhookWindowsHookEx(hook)
+            self._thread_id = 0
+
+
+class FakeKeyboardBackend(KeyboardBackend):
+    """In-process keyboard for tests and benchmarks. `press()`/`release()`
+    run the hooks on the calling thread and return False if suppressed.
+    `drop_hooks()` simulates Windows silently removing the OS hook: the
+    callbacks stay registered but get nothing until reinstall(), while
+    last_input_ns() still advances. `installs` counts OS hook installs."""
+
+    def __init__(self):
+        self._callbacks = _CallbackList()
+        self._installed = False
+        self._input_ns = 0
+        self.installs = 0
+
+    def hook(self, callback, suppress=False):
+        remove = self._callbacks.add(callback, suppress)
+        if not self._installed:
+            self.reinstall()
+
+        def _unhook():
+            if not remove():
+                self._installed = False
+        return _unhook
+
+    def probe(self):
+        return True
+
+    def last_input_ns(self):
+        return self._input_ns
+
+    def reinstall(self):
+        self._installed = True
+        self.installs += 1
+
+    def drop_hooks(self) -> None:
+        self._installed = False
+
+    def press(self, scan_code: int) -> bool:
+        return self._emit(KEY_DOWN, scan_code)
+
+    def release(self, scan_code: int) -> bool:
+        return self._emit(KEY_UP, scan_code)
+
+    def _emit(self, event_type: str, scan_code: int) -> bool:
+        self._input_ns = monotonic_ns()
+        if not self._installed:
+            return True
+        return self._callbacks.deliver(KeyEvent(scan_code, event_type, time=time.time()))
+
+
+def default_keyboard_backend() -> KeyboardBackend:
+    if sys.platform == "win32":
+        return Win32KeyboardBackend()
+    return KeyboardLibBackend()
@@ -0,0 +1,208 @@
+import logging
+import sys
+from time import monotonic_ns
+from typing import Callable
+
+from . import idle
+
+logger = logging.getLogger(__name__)
+
+# on_move(x, y) – reported by the suppressing hook while the cursor is frozen
+MoveCallback = Callable[[int, int], None]
+
+WM_MOUSEMOVE = 0x0200
+
+
+class MouseBackend:
+    """Cursor control plus the suppressing hook used while frozen.
+    Buttons are named "left" / "right" / "middle"."""
+
+    last_event_ns = 0       # monotonic_ns of the last event a hook delivered
+
+    @property
+    def position(self) -> tuple[int, int]:
+        raise NotImplementedError
+
+    @position.setter
+    def position(self, value) -> None:
+        raise NotImplementedError
+
+    def press(self, button: str) -> None:
+        raise NotImplementedError
+
+    def release(self, button: str) -> None:
+        raise NotImplementedError
+
+    def start_suppressing(self, on_move: MoveCallback) -> None:
+        raise NotImplementedError
+
+    def stop_suppressing(self) -> None:
+        raise NotImplementedError
+
+    def warm_up(self) -> None:
+        """Install any long-lived hook ahead of the first freeze."""
+
+    def close(self) -> None:
+        """Remove the hooks installed by warm_up()."""
+
+    def probe(self) -> bool:
+        """Whether the hook watchdog can check the long-lived hook: it sees
+        every mouse event and last_input_ns() is known. Injects nothing."""
+        return False
+
+    def last_input_ns(self) -> int | None:
+        """monotonic_ns of the newest input the OS has seen; None if
+        unknown."""
+        return None
+
+    def reinstall(self) -> None:
+        self.close()
+        self.warm_up()
+
+
+class PynputMouseBackend(MouseBackend):
+    """On Windows one listener stays installed and a flag decides, per
+    event, whether it suppresses; freeze and unfreeze only flip that flag.
+    Elsewhere (or with persistent=False) a suppressing listener is started
+    on every freeze and stopped on unfreeze."""
+
+    def __init__(self, persistent: bool = sys.platform == "win32"):
+        from pynput.mouse import Button, Controller
+        self._buttons = Button
+        self._controller = Controller()
+        self._listener = None
+        self._persistent = persistent
+        self._on_move: MoveCallback | None = None      # set while suppressing
+
+    @property
+    def position(self) -> tuple[int, int]:
+        return self._controller.position
+
+    @position.setter
+    def position(self, value) -> None:
+        self._controller.position = value
+
+    def press(self, button: str) -> None:
+        self._controller.press(getattr(self._buttons, button))
+
+    def release(self, button: str) -> None:
+        self._controller.release(getattr(self._buttons, button))
+
+    def start_suppressing(self, on_move: MoveCallback) -> None:
+        if self._persistent:
+            self.warm_up()
+            self._on_move = on_move
+            return
+        from pynput.mouse import Listener as MouseListener
+        if not self._listener:
+            self._listener = MouseListener(
+                on_move=on_move,
+                on_click=lambda *a, **k: None,
+                on_scroll=lambda *a, **k: None,
+                suppress=True
+            )
+            self._listener.start()
+
+    def stop_suppressing(self) -> None:
+        if self._persistent:
+            self._on_move = None
+        elif self._listener:
+            self._listener.stop()
+            self._listener = None
+
+    def warm_up(self) -> None:
+        if self._persistent and not self._listener:
+            from pynput.mouse import Listener as MouseListener
+            self._listener = MouseListener(win32_event_filter=self._filter)
+            self._listener.start()
+            self._listener.wait()
+
+    def close(self) -> None:
+        self._on_move = None
+        if self._listener:
+            self._listener.stop()
+            self._listener = None
+
+    def probe(self) -> bool:
+        return self._persistent and self._listener is not None
+
+    def last_input_ns(self) -> int | None:
+        return idle.last_input_ns()
+
+    def reinstall(self) -> None:
+        on_move = self._on_move
+        self.close()
+        self.warm_up()
+        self._on_move = on_move     # keep suppressing if frozen
+
+    def _filter(self, msg, data):
+        # runs inside the low-level hook for every mouse event
+        self.last_event_ns = monotonic_ns()
+        on_move = self._on_move
+        if on_move is None:
+            return False        # pass through; skip pynput's own dispatch
+        if msg == WM_MOUSEMOVE:
+            on_move(data.pt.x, data.pt.y)
+        self._listener.suppress_event()
+
+
+class FakeMouseBackend(MouseBackend):
+    """In-process cursor for tests and benchmarks. `user_move()` simulates
+    physical movement and is always seen by the (never dropped) hook;
+    `writes` counts programmatic position changes and `presses` button
+    presses. `clip` is set by FakeConfineBackend."""
+
+    def __init__(self, position=(0, 0)):
+        self._position = tuple(position)
+        self.writes = 0
+        self.reads = 0
+        self.pressed: set[str] = set()
+        self.presses = 0
+        self.suppressing = False
+        self.clip: tuple[int, int] | None = None
+        self._on_move: MoveCallback | None = None
+
+    @property
+    def position(self) -> tuple[int, int]:
+        self.reads += 1
+        return self._position
+
+    @position.setter
+    def position(self, value) -> None:
+        self.writes += 1
+        self._position = tuple(value)
+
+    def press(self, button: str) -> None:
+        self.presses += 1
+        self.pressed.add(button)
+
+    def release(self, button: str) -> None:
+        self.pressed.discard(button)
+
+    def start_suppressing(self, on_move: MoveCallback) -> None:
+        self.suppressing = True
+        self._on_move = on_move
+
+    def stop_suppressing(self) -> None:
+        self.suppressing = False
+        self._on_move = None
+
+    def probe(self) -> bool:
+        return True
+
+    def last_input_ns(self) -> int | None:
+        return self.last_event_ns
+
+    def user_move(self, x: int, y: int) -> None:
+        # the real hook reports the attempted position; a suppressed move can
+        # still leak through (e.g. via raw input), so the cursor does move here
+        # unless it is confined
+        self.last_event_ns = monotonic_ns()
+        self._position = self.clip or (x, y)
+        on_move = self._on_move
+        if on_move:
+            on_move(x, y)
+
+
+def default_mouse_backend() -> MouseBackend:
+    return PynputMouseBackend()
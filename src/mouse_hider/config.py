@@ -1,10 +1,21 @@
 import json
+import os
+import threading
+from collections import deque
+from contextlib import contextmanager
 from dataclasses import dataclass, asdict, field, fields
-from typing import Any, Callable, List
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Iterable, List, Mapping, get_args, get_origin
 import logging
+from time import monotonic
 
 logger = logging.getLogger(__name__)
 
+# fn(cfg, field_name, old, new): once per changed field
+FieldCallback = Callable[["Config", str, Any, Any], None]
+# fn(cfg, changes): changes maps each changed field to (old, new)
+BatchCallback = Callable[["Config", Mapping[str, tuple[Any, Any]]], None]
+
 class SingletonMeta(type):
     """Metaclass that ensures only one instance per class."""
     _instances: dict[type, object] = {}
@@ -27,20 +38,138 @@ class Config(metaclass=SingletonMeta):
     UNFROZEN_COORDS: tuple[int, int]
     POSITION_CHECK_INTERVAL: float
     FOCUS_CHECK_INTERVAL: float
+    # "confine": clip the cursor to the frozen point at OS level; falls
+    # back to "event" where that is unavailable.
+    # "event": correct the frozen cursor when the hook reports movement,
+    # plus a safety check every POSITION_SAFETY_INTERVAL s (0 = never).
+    # "poll": rewrite it every POSITION_CHECK_INTERVAL s.
+    POSITION_MODE: str = "confine"
+    POSITION_SAFETY_INTERVAL: float = 0.5
+    # per-game overrides keyed by exe name, e.g.
+    # {"Other.exe": {"FROZEN_COORDS": [1280, 720], "HOTKEY_SC": 79}};
+    # see profiles.PROFILE_FIELDS for the keys a profile may set
+    PROFILES: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    # time a hotkey callback may spend inside the keyboard hook; slower
+    # non-suppressing callbacks are moved to a worker thread
+    HOOK_BUDGET_MS: float = 1.0
+    # self-test a hook that has been quiet this long (s) and reinstall it if
+    # the test event never arrives; 0 disables the watchdog
+    HOOK_WATCHDOG_INTERVAL: float = 5.0
+    # check config.json for hand edits every CONFIG_WATCH_INTERVAL s,
+    # backing off while it is unchanged; 0 disables hot reload
+    CONFIG_WATCH_INTERVAL: float = 1.0
 
     # internal:
-    _on_change: List[Callable[['Config', str, Any, Any], None]] = field(
+    _on_change: List[FieldCallback] = field(
+        default_factory=list, init=False, repr=False)
+    _by_field: Dict[str, List[FieldCallback]] = field(
+        default_factory=dict, init=False, repr=False)
+    _on_batch: List[BatchCallback] = field(
         default_factory=list, init=False, repr=False)
+    _batch_by_field: Dict[str, List[BatchCallback]] = field(
+        default_factory=dict, init=False, repr=False)
     _initialized: bool = field(default=False, init=False, repr=False)
 
     def __post_init__(self):
         # now that real fields are in place, set up your internals
-        self._on_change: List[Callable[["Config", str, Any, Any], None]] = []
+        self._on_change: List[FieldCallback] = []
+        self._by_field: Dict[str, List[FieldCallback]] = {}
+        self._on_batch: List[BatchCallback] = []
+        self._batch_by_field: Dict[str, List[BatchCallback]] = {}
+        self._lock = threading.RLock()      # writers and transactions
+        self._batch: Dict[str, Any] | None = None   # field -> old value
+        # hot paths read `config.snapshot.X`: one load, a consistent view
+        self.snapshot: ConfigSnapshot = ConfigSnapshot(self, 1)
         self._initialized: bool = True
 
-    def add_callback(self, fn: Callable[['Config', str, Any, Any], None]):
-        """Register fn(cfg, field_name, old, new)."""
-        self._on_change.append(fn)
+    def publish(self) -> "ConfigSnapshot":
+        """Swap in a new snapshot of the current field values."""
+        with self._lock:
+            snapshot = ConfigSnapshot(self, self.snapshot.version + 1)
+            self.snapshot = snapshot
+        return snapshot
+
+    @contextmanager
+    def transaction(self):
+        """Apply several assignments as one change.
+
+        Inside the block fields change without callbacks; other threads'
+        writes wait. On exit one snapshot is published, each batch
+        callback fires once with every changed field it subscribes to, and
+        field callbacks fire once per changed field. An exception rolls
+        the fields back and fires nothing. Nested transactions join the
+        outer one.
+        """
+        with self._lock:
+            if self._batch is not None:
+                yield self
+                return
+            self._batch = {}
+            try:
+                yield self
+            except BaseException:
+                for name, old in self._batch.items():
+                    object.__setattr__(self, name, old)
+                raise
+            finally:
+                batch, self._batch = self._batch, None
+            changes = {name: (old, getattr(self, name)) for name, old in batch.items()
+                       if getattr(self, name) != old}
+            if changes:
+                self.publish()
+        if changes:
+            self._notify(changes)
+
+    def _notify(self, changes: Dict[str, tuple[Any, Any]]):
+        for name, (old, new) in changes.items():
+            for cb in list(self._on_change):
+                cb(self, name, old, new)
+            for cb in list(self._by_field.get(name, ())):
+                cb(self, name, old, new)
+        for cb in list(self._on_batch):
+            cb(self, MappingProxyType(changes))
+        subscribed: Dict[BatchCallback, Dict[str, tuple[Any, Any]]] = {}
+        for name, change in changes.items():
+            for cb in self._batch_by_field.get(name, ()):
+                subscribed.setdefault(cb, {})[name] = change
+        for cb, own in subscribed.items():
+            cb(self, MappingProxyType(own))
+
+    def _check_fields(self, fields: Iterable[str]) -> tuple[str, ...]:
+        fields = tuple(fields)
+        for name in fields:
+            if name.startswith("_") or name not in self.__dataclass_fields__:
+                raise ValueError(f"Unknown config field: {name}")
+        return fields
+
+    def add_callback(self, fn: FieldCallback, fields: Iterable[str] | None = None):
+        """Register fn(cfg, field_name, old, new) for every change, or only
+        for changes to the named `fields`. A transaction() calls it once per
+        changed field."""
+        if fields is None:
+            self._on_change.append(fn)
+            return
+        for name in self._check_fields(fields):
+            self._by_field.setdefault(name, []).append(fn)
+
+    def add_batch_callback(self, fn: BatchCallback, fields: Iterable[str] | None = None):
+        """Register fn(cfg, changes), where `changes` maps each changed field
+        (of `fields`, if given) to (old, new). It fires once per assignment,
+        or once per transaction() however many fields it changed."""
+        if fields is None:
+            self._on_batch.append(fn)
+            return
+        for name in self._check_fields(fields):
+            self._batch_by_field.setdefault(name, []).append(fn)
+
+    def remove_callback(self, fn: FieldCallback | BatchCallback):
+        for callbacks in (self._on_change, self._on_batch):
+            if fn in callbacks:
+                callbacks.remove(fn)
+        for by_field in (self._by_field, self._batch_by_field):
+            for callbacks in by_field.values():
+                if fn in callbacks:
+                    callbacks.remove(fn)
 
     def __setattr__(self, name: str, value: Any):
         # if it’s one of our dataclass fields and we’re past __post_init__,
@@ -49,31 +178,277 @@ class Config(metaclass=SingletonMeta):
             getattr(self, "_initialized", False)
             and name in self.__dataclass_fields__
         ):
-            old = getattr(self, name)
-            super().__setattr__(name, value)
-            if old != value:
-                for cb in self._on_change:
-                    cb(self, name, old, value)
+            with self._lock:
+                old = getattr(self, name)
+                super().__setattr__(name, value)
+                if old == value:
+                    return
+                if self._batch is not None:
+                    self._batch.setdefault(name, old)
+                    return
+                self.publish()      # before the callbacks, so they see it
+            self._notify({name: (old, value)})
         else:
             # during __init__ or for non‑field attrs, do normal setattr
             super().__setattr__(name, value)
 
+def _frozen(value):
+    if isinstance(value, list):
+        return tuple(_frozen(v) for v in value)
+    if isinstance(value, dict):
+        return MappingProxyType({k: _frozen(v) for k, v in value.items()})
+    return value
+
+
+class ConfigSnapshot:
+    """Read-only copy of every public Config field plus a `version` that
+    grows with each change.
+
+    Config swaps in a new one by reference on every change, so a reader
+    holding a snapshot sees one consistent set of values and can keep
+    derived state until the version moves on. Lists become tuples and
+    dicts read-only mappings.
+    """
+
+    __slots__ = tuple(f.name for f in fields(Config) if not f.name.startswith("_")) \
+        + ("version",)
+
+    def __init__(self, config: Config, version: int):
+        for name in self.__slots__[:-1]:
+            object.__setattr__(self, name, _frozen(getattr(config, name)))
+        object.__setattr__(self, "version", version)
+
+    def __setattr__(self, name: str, value: Any):
+        raise AttributeError("ConfigSnapshot is read-only")
+
+    def __repr__(self):
+        return f"ConfigSnapshot(version={self.version})"
+
+
 config_path = "config/config.json"
-    
-def save_config(config, field, old, new):
-    logger.info("Saving config: %s changed from %s -> %s", field, old, new)
-    
+SAVE_DEBOUNCE = 0.25    # seconds of quiet before a burst of changes is written
+
+
+def file_digest(text: str) -> bytes:
+    """Content hash of config.json as read in text mode, so line endings
+    don't matter."""
+    from hashlib import blake2b
+    return blake2b(text.encode("utf-8"), digest_size=16).digest()
+
+
+def _public_data(config) -> dict:
     # Grab only the "public" fields (i.e. skip anything beginning with "_")
-    public_data = {
+    return {
         f.name: getattr(config, f.name)
         for f in fields(config)
         if not f.name.startswith("_")
     }
-    try:
-        with open(config_path, 'w') as f:
-            json.dump(public_data, f, indent=4)
-    except Exception as e:
-        logger.exception(e)
+
+
+def _matches(value, tp) -> bool:
+    """Whether a value parsed from JSON fits the Config field type `tp`."""
+    if tp is Any:
+        return True
+    if tp is float:
+        return isinstance(value, (int, float)) and not isinstance(value, bool)
+    if tp is int:
+        return isinstance(value, int) and not isinstance(value, bool)
+    origin, args = get_origin(tp), get_args(tp)
+    if origin is tuple:         # JSON has no tuples: a list of that length
+        return (isinstance(value, list) and len(value) == len(args)
+                and all(_matches(v, a) for v, a in zip(value, args)))
+    if origin is dict:
+        return isinstance(value, dict) and all(
+            _matches(k, args[0]) and _matches(v, args[1]) for k, v in value.items())
+    return isinstance(value, tp)
+
+
+def _valid_value(name: str, value) -> bool:
+    """Whether a value read from config.json fits Config field `name`;
+    logs the value and returns False if it does not."""
+    expected = Config.__dataclass_fields__[name].type
+    if _matches(value, expected):
+        return True
+    logger.warning("Ignoring %s = %r: expected %s", name, value,
+                   expected if get_origin(expected) else expected.__name__)
+    return False
+
+
+class ConfigWriter:
+    """Coalesces config saves onto one background thread (or asyncio task,
+    see run_async).
+
+    Every schedule() pushes the deadline back by SAVE_DEBOUNCE. The file is
+    written to a temp file and swapped in with os.replace, so a crash never
+    leaves a half-written config.json behind. Data equal to what is already
+    on disk is not written again; `recent_digests` identifies our own
+    writes to the file watcher. Exactly one of the two owns the writes: run_async
+    stops the thread before taking over, and no thread is started while it
+    runs.
+    """
+
+    def __init__(self, path: str = config_path, debounce: float = SAVE_DEBOUNCE):
+        self.path = path
+        self.debounce = debounce
+        self.writes = 0
+        # the last few, so a write the watcher saw late is still ours
+        self.recent_digests: deque[bytes] = deque(maxlen=8)
+        self._on_disk: dict | None = None
+        self._cond = threading.Condition()
+        self._config: "Config | None" = None
+        self._deadline: float | None = None
+        self._generation = 0
+        self._thread: threading.Thread | None = None
+        self._async_wake: Callable[[], None] | None = None
+
+    def schedule(self, config: "Config") -> None:
+        with self._cond:
+            self._config = config
+            self._generation += 1
+            self._deadline = monotonic() + self.debounce
+            if self._async_wake is None:
+                self._start_thread()
+            self._wake()
+
+    def assume_on_disk(self, data: dict) -> None:
+        """Record that the file already holds `data` (e.g. after it was
+        read back), so a save of the same values is skipped."""
+        with self._cond:
+            self._on_disk = data
+
+    def wrote(self, digest: bytes) -> bool:
+        """Whether config.json content with this digest is one of our own
+        recent writes."""
+        with self._cond:
+            return digest in self.recent_digests
+
+    def flush(self, timeout: float = 2.0) -> None:
+        """Write any pending change now and wait for it to hit the disk."""
+        with self._cond:
+            if self._deadline is None:
+                return
+            self._deadline = monotonic()
+            self._wake()
+            self._cond.wait_for(lambda: self._deadline is None, timeout)
+
+    def _start_thread(self):
+        # caller holds self._cond
+        if not self._thread or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def _wake(self):
+        # caller holds self._cond
+        self._cond.notify()
+        if self._async_wake:
+            self._async_wake()
+
+    def _take(self) -> tuple[dict | None, int, float | None]:
+        """(data, generation, None) once due, else (None, 0, seconds to wait)."""
+        if self._deadline is None:
+            return None, 0, None
+        remaining = self._deadline - monotonic()
+        if remaining > 0:
+            return None, 0, remaining
+        return _public_data(self._config), self._generation, None
+
+    def _done(self, generation: int):
+        # a change that arrived during the write keeps its deadline
+        if self._generation == generation:
+            self._deadline = None
+        self._cond.notify_all()
+
+    def _run(self):
+        with self._cond:
+            while self._async_wake is None:     # run_async took over
+                data, generation, timeout = self._take()
+                if data is None:
+                    self._cond.wait(timeout)
+                    continue
+                self._cond.release()
+                try:
+                    self._write(data)
+                finally:
+                    self._cond.acquire()
+                self._done(generation)
+
+    async def run_async(self):
+        """Asyncio variant of the writer thread; flushes when cancelled.
+        Writes (open, fsync, replace) run on an executor thread, not the
+        loop."""
+        import asyncio
+        loop = asyncio.get_running_loop()
+        wake = asyncio.Event()
+        with self._cond:
+            self._async_wake = lambda: loop.call_soon_threadsafe(wake.set)
+            thread, self._thread = self._thread, None
+            self._cond.notify_all()
+        try:
+            if thread is not None:
+                await loop.run_in_executor(None, thread.join)
+            while True:
+                with self._cond:
+                    data, generation, timeout = self._take()
+                if data is None:
+                    try:
+                        await asyncio.wait_for(wake.wait(), timeout)
+                    except asyncio.TimeoutError:
+                        pass
+                    wake.clear()
+                    continue
+                await loop.run_in_executor(None, self._write, data)
+                with self._cond:
+                    self._done(generation)
+        finally:
+            if thread is not None:
+                thread.join()
+            with self._cond:
+                # still the owner until the last write lands; the loop may
+                # already be closed, so wake nothing
+                self._async_wake = lambda: None
+                if self._deadline is not None:
+                    self._deadline = monotonic()
+                data, generation, _ = self._take()
+            if data is not None:
+                self._write(data)       # shutting down: nothing left to stall
+            with self._cond:
+                if data is not None:
+                    self._done(generation)
+                self._async_wake = None
+                if self._deadline is not None:     # changed during that write
+                    self._start_thread()
+
+    def _write(self, data: dict) -> None:
+        if data == self._on_disk:
+            return
+        tmp_path = self.path + ".tmp"
+        try:
+            text = json.dumps(data, indent=4)
+            with open(tmp_path, 'w') as f:
+                f.write(text)
+                f.flush()
+                os.fsync(f.fileno())
+            digest = file_digest(text)
+            with self._cond:            # see wrote(): no window between the two
+                os.replace(tmp_path, self.path)
+                self.recent_digests.append(digest)
+            self._on_disk = data
+            self.writes += 1
+        except Exception as e:
+            logger.exception(e)
+
+
+config_writer = ConfigWriter()
+
+
+def save_config(config, changes):
+    for field, (old, new) in changes.items():
+        logger.info("Saving config: %s changed from %s -> %s", field, old, new)
+    config_writer.schedule(config)
+
+
+def flush_config() -> None:
+    config_writer.flush()
 
 
 def load_config() -> Config:
@@ -84,3 +459,26 @@ def load_config() -> Config:
         return Config(**cfg_raw)
     except Exception as e:
         logger.exception(e)
+
+
+def reload_config() -> list[str]:
+    """Re-read config.json into the existing Config, for a hot restart.
+
+    Values are assigned without firing callbacks: the components that
+    subscribe to them are about to be rebuilt anyway. A value that does not
+    fit its field's type is logged and skipped. Returns the names of the
+    fields that changed.
+    """
+    config = Config()
+    with open(config_path, 'r') as f:
+        cfg_raw = json.load(f)
+    changed = []
+    for name, value in cfg_raw.items():
+        if name.startswith("_") or name not in config.__dataclass_fields__:
+            continue
+        if getattr(config, name) != value and _valid_value(name, value):
+            object.__setattr__(config, name, value)
+            changed.append(name)
+    if changed:
+        config.publish()
+    return changed
@@ -0,0 +1,95 @@
+import json
+import logging
+import os
+from .config import (Config, _public_data, _valid_value, config_path, config_writer,
+                     file_digest)
+from .scheduler import Job, Scheduler
+
+logger = logging.getLogger(__name__)
+
+
+class ConfigFileWatcher:
+    """Applies hand edits of config.json without a restart.
+
+    Every CONFIG_WATCH_INTERVAL s (backing off to 8x while nothing changes)
+    the file is stat()ed. Only when its mtime or size moved is it read and
+    hashed, and only a new hash that ConfigWriter did not produce itself is
+    parsed. The fields that differ from the live Config are then assigned
+    in one transaction, so subscribers reload once through the normal
+    callback path. A value that does not fit its field's type is logged
+    and skipped; the live value stays.
+    """
+
+    def __init__(self, path: str = config_path):
+        self.path = path
+        self.config = Config()
+        self.reloads = 0
+        self._stat: tuple[int, int] | None = None
+        self._digest: bytes | None = None
+        self._job: Job | None = None
+
+    def start(self):
+        interval = self.config.snapshot.CONFIG_WATCH_INTERVAL
+        if not interval:
+            return
+        self._stat, self._digest = self._read_state()[:2]   # what load_config saw
+        self._job = Scheduler().register(
+            "config.watch", self.check,
+            lambda: self.config.snapshot.CONFIG_WATCH_INTERVAL,
+            max_interval=8 * interval, blocking=True)
+
+    def stop(self):
+        if self._job:
+            Scheduler().unregister(self._job)
+            self._job = None
+
+    def _read_state(self) -> tuple[tuple[int, int] | None, bytes | None, str | None]:
+        try:
+            st = os.stat(self.path)
+            with open(self.path, "r") as f:
+                text = f.read()
+        except OSError:
+            return None, None, None
+        return (st.st_mtime_ns, st.st_size), file_digest(text), text
+
+    def check(self) -> bool:
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return False
+        if (st.st_mtime_ns, st.st_size) == self._stat:
+            return False
+        self._stat, digest, text = self._read_state()
+        if digest is None or digest == self._digest:
+            return False                # touched, not changed
+        self._digest = digest
+        if config_writer.wrote(digest):
+            return False                # our own save
+        self._apply(text)
+        return True
+
+    def _apply(self, text: str):
+        try:
+            raw = json.loads(text)
+        except ValueError as e:
+            logger.warning("Ignoring %s: %s", self.path, e)
+            return
+        if not isinstance(raw, dict):
+            logger.warning("Ignoring %s: not a JSON object", self.path)
+            return
+        public = _public_data(self.config)
+        unknown = sorted(name for name in raw if name not in public)
+        if unknown:
+            logger.warning("Ignoring unknown config keys %s", unknown)
+        changes = {name: value for name, value in raw.items()
+                   if name in public and public[name] != value
+                   and _valid_value(name, value)}
+        if not changes:
+            return
+        # the file already holds these values; don't write them back
+        config_writer.assume_on_disk({**public, **changes})
+        with self.config.transaction():
+            for name, value in changes.items():
+                setattr(self.config, name, value)
+        self.reloads += 1
+        logger.info("Config file changed: %s", ", ".join(changes))
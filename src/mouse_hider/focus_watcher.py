@@ -1,14 +1,18 @@
 import threading
-import time
-import psutil
-import win32gui
-import win32process
 import logging
+from queue import SimpleQueue
+from time import monotonic_ns
 
 from .config import Config
+from .backends.focus import FocusBackend, PollingFocusBackend, default_focus_backend
+from .metrics import REGISTRY
+from .process_cache import ProcessNameCache
+from .profiles import Profile, compile_profiles
 
 logger = logging.getLogger(__name__)
 
+_STOP = object()
+
 
 class FocusWatcher:
 
@@ -20,41 +24,135 @@ class FocusWatcher:
             cls._instance._initialized = False
         return cls._instance
 
-    def __init__(self, on_gain=None, on_loss=None):
+    def __init__(self, on_gain=None, on_loss=None, backend: FocusBackend | None = None,
+                 on_switch=None):
         if self._initialized:
             return
         self.config = Config()
-        self.update_config()
+        # exe name -> Profile; the foreground exe picks one by lookup
+        self.profiles = compile_profiles(self.config.snapshot)
+        self.profile: Profile = self.profiles[self.config.snapshot.GAME_EXE_NAME.lower()]
+        self._profile_lock = threading.Lock()
         self.on_gain = on_gain
         self.on_loss = on_loss
+        self.on_switch = on_switch
         self.game_focused = False
+        self.backend = backend or default_focus_backend()
+        self.process_names = ProcessNameCache(self.backend)
+        # foreground PIDs pushed by the backend; the thread blocks on get()
+        self._changes: SimpleQueue = SimpleQueue()
+        self._put = self._changes.put       # swapped by run_async()
+        self._started = False
+        self._last_pid: int | None = None
+        self.last_event_ns = 0              # read by the hook watchdog
+        self._gains = REGISTRY.counter("focus.gain")
+        self._losses = REGISTRY.counter("focus.loss")
+        self._switches = REGISTRY.counter("profile.switches")
         self._thread = threading.Thread(target=self._watch_focus, daemon=True)
 
         self._initialized = True
 
-    def update_config(self):
-        self.exe_name = self.config.GAME_EXE_NAME.lower()
+    def set_profiles(self, profiles: dict[str, Profile]):
+        """Install recompiled profiles, keeping the active game if it still
+        has one."""
+        with self._profile_lock:
+            self.profiles = profiles
+            default = profiles[self.config.snapshot.GAME_EXE_NAME.lower()]
+            self._switch(profiles.get(self.profile.exe_name, default))
+        # re-evaluate the current window against the new exe names
+        if self._started:
+            pid = self.backend.foreground_pid()
+            if pid is not None:
+                self._push(pid)
 
     def start(self):
         self._thread.start()
+        self._start_backend()
+
+    async def run_async(self):
+        """Asyncio variant of start(): runs until cancelled."""
+        import asyncio
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        self._put = lambda pid: loop.call_soon_threadsafe(queue.put_nowait, pid)
+        self._start_backend()
+        try:
+            while True:
+                self._on_change(await queue.get())
+        finally:
+            self.backend.stop()
+            self._started = False
+            self._put = self._changes.put
 
-    def _is_game_focused(self):
+    def _start_backend(self):
         try:
-            hwnd = win32gui.GetForegroundWindow()
-            _, pid = win32process.GetWindowThreadProcessId(hwnd)
-            return psutil.Process(pid).name().lower() == self.exe_name
-        except Exception:
+            self.backend.start(self._push)
+        except OSError as e:
+            logger.warning("Focus hook unavailable (%s); falling back to polling.", e)
+            self.backend = PollingFocusBackend(
+                lambda: self.config.snapshot.FOCUS_CHECK_INTERVAL)
+            self.process_names.backend = self.backend
+            self.backend.start(self._push)
+        self._started = True
+
+    def _push(self, pid: int):
+        self.last_event_ns = monotonic_ns()
+        self._last_pid = pid
+        self._put(pid)
+
+    def probe(self) -> bool:
+        """Self-test without an event: a hook that is still alive has
+        reported the window that is in the foreground now."""
+        pid = self.backend.foreground_pid()
+        if pid is None or not self._started:
             return False
+        if pid == self._last_pid:
+            self.last_event_ns = monotonic_ns()
+        return True
+
+    def reinstall(self):
+        self.backend.stop()
+        self._start_backend()
+
+    def stop(self):
+        self.backend.stop()
+        self._started = False
+        self._changes.put(_STOP)
+        self._thread.join(timeout=1)
 
     def _watch_focus(self):
         while True:
-            focused_now = self._is_game_focused()
-            if focused_now and not self.game_focused:
-                self.game_focused = True
-                logger.info(f"{self.exe_name} focused – hot‑key active.")
-                self.on_gain()
-            elif not focused_now and self.game_focused:
+            pid = self._changes.get()
+            if pid is _STOP:
+                return
+            self._on_change(pid)
+
+    def _switch(self, profile: Profile):
+        # caller holds _profile_lock
+        if profile is self.profile:
+            return
+        previous, self.profile = self.profile, profile
+        if profile == previous:
+            return                      # recompiled unchanged: nothing to reload
+        if profile.exe_name != previous.exe_name:
+            self._switches.inc()
+            logger.info("Profile → %s", profile.exe_name)
+        if self.on_switch:
+            self.on_switch(profile)
+
+    def _on_change(self, pid: int):
+        with self._profile_lock:
+            profile = self.profiles.get(self.process_names.name(pid))
+            # leaving the game, or going straight to another one
+            if self.game_focused and profile is not self.profile:
                 self.game_focused = False
-                logger.info(f"{self.exe_name} lost focus – auto‑unfreeze.")
+                self._losses.inc()
+                logger.info("%s lost focus – auto‑unfreeze.", self.profile.exe_name)
                 self.on_loss()
-            time.sleep(self.config.FOCUS_CHECK_INTERVAL)
+                self.process_names.prune()
+            if profile is not None and not self.game_focused:
+                self._switch(profile)
+                self.game_focused = True
+                self._gains.inc()
+                logger.info("%s focused – hot‑key active.", profile.exe_name)
+                self.on_gain()
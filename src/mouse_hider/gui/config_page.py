@@ -5,10 +5,8 @@ from PySide6.QtCore import Signal
 from PySide6.QtWidgets import QGridLayout, QApplication, QMainWindow, QWidget, \
     QVBoxLayout, QHBoxLayout, QLabel, QTabWidget, QMenu, QSystemTrayIcon, \
     QSizePolicy, QMessageBox, QLineEdit, QPushButton, QStackedWidget
-import psutil
 
 from ..config import Config
-from .process_page import ProcessPage
 from .utils import HotkeyRecorder
 
 
@@ -189,6 +187,11 @@ class ConfigPage(QWidget):
             self.display_input.setText(f"{keys[-1]} (code: {codes[-1]})")
 
     def _save_config(self):
+        # one transaction: a single config write and component reload
+        with self.cfg.transaction():
+            self._apply_fields()
+
+    def _apply_fields(self):
         exe_name = self.input_exe_name.text()
 
         try:
@@ -200,7 +203,7 @@ class ConfigPage(QWidget):
             ufy = int(self.ufy_input.text())
             self.cfg.UNFROZEN_COORDS = [ufx, ufy]
         except (ValueError, TypeError) as e:
-            logger.warning("Error in _save_config: ", e)
+            logger.warning("Error in _save_config: %s", e)
             self.coord_warning_label.setText("INVALID COORD VALUE")
 
         if exe_name and exe_name.lower().endswith(".exe"):
@@ -220,6 +223,8 @@ class ConfigPage(QWidget):
         self.stacked.setCurrentWidget(self.config_page)
 
     def _open_process_page(self):
+        from .process_page import ProcessPage   # imports psutil
+
         page = ProcessPage(self)
         page.back_requested.connect(self._open_config_page)
         self.stacked.addWidget(page)
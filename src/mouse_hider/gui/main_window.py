@@ -6,7 +6,11 @@ from PySide6.QtWidgets import (
 )
 from PySide6.QtGui    import QIcon, QAction, QCloseEvent, QGuiApplication
 
-from .config_page import ConfigPage
+from ..log import dump_recent
+from ..metrics import REGISTRY
+
+METRICS_PATH = "metrics.json"
+RECENT_LOG_PATH = "recent.log"
 
 
 class MainWindow(QMainWindow):
@@ -15,6 +19,8 @@ class MainWindow(QMainWindow):
         :param restart_callback: callable or None.
                                  If provided, a “Restart” item is added to
                                  the tray menu that triggers this callback.
+                                 It may return the restart time in ms,
+                                 which is shown as a tray message.
         """
         super().__init__()
         self.setWindowTitle("Mouse Hider")
@@ -57,6 +63,8 @@ class MainWindow(QMainWindow):
         self.stacked.setCurrentWidget(self.main_page)
 
     def _open_config(self):
+        from .config_page import ConfigPage     # first use pulls in the page
+
         self.config_page = ConfigPage(parent=self)
         self.config_page.back_requested.connect(self._open_main)
         self.stacked.addWidget(self.config_page)
@@ -75,9 +83,18 @@ class MainWindow(QMainWindow):
 
         # ---- NEW: restart option -----------------------------
         if callable(restart_callback):
-            act_restart = QAction("Restart", self, triggered=restart_callback)
+            act_restart = QAction("Restart", self,
+                                  triggered=lambda: self._restart(restart_callback))
             menu.addAction(act_restart)
 
+        act_metrics = QAction("Dump metrics", self,
+                              triggered=lambda: REGISTRY.dump(METRICS_PATH))
+        menu.addAction(act_metrics)
+
+        act_log = QAction("Dump recent log", self,
+                          triggered=lambda: dump_recent(RECENT_LOG_PATH))
+        menu.addAction(act_log)
+
         menu.addSeparator()
 
         act_quit = QAction("Quit", self, triggered=QGuiApplication.quit)
@@ -87,6 +104,12 @@ class MainWindow(QMainWindow):
         self.tray.activated.connect(self._on_tray_activated)
         self.tray.show()
 
+    def _restart(self, restart_callback):
+        elapsed_ms = restart_callback()
+        if elapsed_ms is not None:
+            self.tray.showMessage("Mouse Hider", f"Restarted in {elapsed_ms:.0f} ms",
+                                  QSystemTrayIcon.Information, 2000)
+
     def _on_tray_activated(self, reason):
         if reason == QSystemTrayIcon.DoubleClick:
             self._restore_from_tray()
@@ -1,17 +1,103 @@
-import sys
-import random
 import logging
-from PySide6.QtCore import Signal
-from PySide6.QtWidgets import QGridLayout, QApplication, QMainWindow, QWidget, \
-    QVBoxLayout, QHBoxLayout, QLabel, QTabWidget, QMenu, QSystemTrayIcon, \
-    QSizePolicy, QMessageBox, QLineEdit, QPushButton, QStackedWidget, QComboBox
+import threading
+from PySide6.QtCore import Qt, QSortFilterProxyModel, QThread, Signal
+from PySide6.QtGui import QStandardItem, QStandardItemModel
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLineEdit, \
+    QListView, QPushButton, QStackedWidget
 import psutil
 
-from ..config import Config
-
 logger = logging.getLogger(__name__)
 
 
+class ProcessIndex:
+    """Running process names by PID, kept between opens of the page.
+
+    A rescan only looks up the names of PIDs it hasn't seen before and
+    drops the ones that are gone. Names are reference-counted, so a name
+    is reported added or removed only when its first or last PID changes.
+    """
+
+    def __init__(self):
+        self._names: dict[int, str | None] = {}    # None: name not readable
+        self._counts: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def pids(self) -> set[int]:
+        with self._lock:
+            return set(self._names)
+
+    def names(self) -> list[str]:
+        with self._lock:
+            return list(self._counts)
+
+    def add(self, pid: int, name: str | None) -> bool:
+        """Record pid; True if `name` was not running before."""
+        with self._lock:
+            self._names[pid] = name
+            if name is None:
+                return False
+            self._counts[name] = self._counts.get(name, 0) + 1
+            return self._counts[name] == 1
+
+    def remove(self, pids) -> list[str]:
+        """Forget pids; returns the names that are no longer running."""
+        gone = []
+        with self._lock:
+            for pid in pids:
+                name = self._names.pop(pid, None)
+                if name is None:
+                    continue
+                self._counts[name] -= 1
+                if not self._counts[name]:
+                    del self._counts[name]
+                    gone.append(name)
+        return gone
+
+
+_INDEX = ProcessIndex()
+
+
+class ProcessScanner(QThread):
+    """Diffs the running PIDs against a ProcessIndex off the GUI thread and
+    streams the name changes in batches."""
+
+    added = Signal(list)
+    removed = Signal(list)
+
+    BATCH_SIZE = 32
+
+    def __init__(self, index: ProcessIndex, parent=None):
+        super().__init__(parent)
+        self.index = index
+
+    def run(self):
+        running = set(psutil.pids())
+        known = self.index.pids()
+        gone = self.index.remove(known - running)
+        if gone:
+            self.removed.emit(gone)
+
+        batch = []
+        for pid in running - known:
+            if self.isInterruptionRequested():
+                return
+            name = self._name(pid)
+            if self.index.add(pid, name):
+                batch.append(name)
+            if len(batch) >= self.BATCH_SIZE:
+                self.added.emit(batch)
+                batch = []
+        if batch:
+            self.added.emit(batch)
+
+    @staticmethod
+    def _name(pid: int) -> str | None:
+        try:
+            return psutil.Process(pid).name()
+        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+            return None
+
+
 class ProcessPage(QWidget):
     back_requested = Signal(str)
 
@@ -29,12 +115,34 @@ class ProcessPage(QWidget):
         self.setLayout(main_layout)
         self.stacked.setCurrentWidget(self.process_page)
 
+        # show what the last scan found right away, then refresh in the background
+        self._add_names(_INDEX.names())
+        self.scanner = ProcessScanner(_INDEX, self)
+        self.scanner.added.connect(self._add_names)
+        self.scanner.removed.connect(self._remove_names)
+        self.scanner.start()
+
     def _create_process_layout(self):
         layout = QVBoxLayout()
 
-        self.process_cb = QComboBox()
-        self.process_cb.addItems(self._get_running_processes())
-        layout.addWidget(self.process_cb)
+        self.filter_input = QLineEdit()
+        self.filter_input.setPlaceholderText("Type to filter…")
+        layout.addWidget(self.filter_input)
+
+        self.model = QStandardItemModel(self)
+        self._items: dict[str, QStandardItem] = {}
+        self.proxy = QSortFilterProxyModel(self)
+        self.proxy.setSourceModel(self.model)
+        self.proxy.setFilterCaseSensitivity(Qt.CaseInsensitive)
+        self.proxy.setSortCaseSensitivity(Qt.CaseInsensitive)
+        self.proxy.sort(0)
+        self.filter_input.textChanged.connect(self.proxy.setFilterFixedString)
+
+        self.process_list = QListView()
+        self.process_list.setModel(self.proxy)
+        self.process_list.setUniformItemSizes(True)
+        self.process_list.doubleClicked.connect(lambda _: self._save_process())
+        layout.addWidget(self.process_list)
 
         btn_layout = QHBoxLayout()
         save_button = QPushButton("Save")
@@ -49,24 +157,34 @@ class ProcessPage(QWidget):
 
         return layout
 
+    def _add_names(self, names: list[str]):
+        for name in names:
+            if name not in self._items:
+                item = QStandardItem(name)
+                item.setEditable(False)
+                self._items[name] = item
+                self.model.appendRow(item)
+
+    def _remove_names(self, names: list[str]):
+        for name in names:
+            item = self._items.pop(name, None)
+            if item is not None:
+                self.model.removeRow(item.row())
+
+    def _selected_name(self) -> str:
+        index = self.process_list.currentIndex()
+        if not index.isValid() and self.proxy.rowCount():
+            index = self.proxy.index(0, 0)      # best match for the filter
+        return index.data() if index.isValid() else ""
+
+    def _stop_scan(self):
+        self.scanner.requestInterruption()
+        self.scanner.wait()
+
     def _save_process(self):
-        text = self.process_cb.currentText()
-        self.back_requested.emit(text)
+        self._stop_scan()
+        self.back_requested.emit(self._selected_name())
 
     def _back_to_conf(self):
+        self._stop_scan()
         self.back_requested.emit("")
-
-    def _get_running_processes(self):
-        process_list = []
-        for process in psutil.process_iter(['pid', 'name']):
-            try:
-                process_info = process.info
-                process_list.append(
-                    f"{process_info['pid']} - {process_info['name']}")
-            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-                pass
-        process_list = [line.split(' - ')[1] for line in process_list]
-        process_list = list(set(process_list))
-        process_list = [process for process in process_list]
-        process_list.sort()
-        return process_list
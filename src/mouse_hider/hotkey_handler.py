@@ -1,60 +1,335 @@
 import logging
-
-from keyboard import on_press_key, on_release_key, unhook_all, unhook_key
+import threading
+from queue import SimpleQueue
+from time import monotonic_ns, perf_counter_ns
 
 from .config import Config
+from .backends.keyboard import KEY_DOWN, KeyboardBackend, default_keyboard_backend
+from .metrics import REGISTRY
+from .profiles import Profile
 from .utils import handle_errors
 
 logger = logging.getLogger(__name__)
 
+# consecutive overruns before a handler is offloaded; a single one is
+# usually another thread holding the GIL
+OFFLOAD_AFTER = 3
+# consecutive on-budget runs on the worker before it returns to the hook
+RECALL_AFTER = 20
+
+
+class KeyboardDispatcher:
+    """Owns the single low-level keyboard hook.
+
+    Every keystroke costs one dict lookup by scan code. Rebinding builds a
+    new table and swaps it in by reference, so the hook is never removed
+    and reinstalled. There is one prebuilt table per distinct set of
+    profile scan-code overrides, and use_profile() switches between them
+    the same way; recompiling profiles whose overrides did not change (a
+    coordinate or exe-name edit) rebuilds nothing.
+
+    Each callback has HOOK_BUDGET_MS to run inside the hook. Overruns are
+    counted and timed; a handler that does not suppress keys and keeps
+    overrunning is offloaded, so the hook only passes the key on and a
+    worker thread runs its callbacks. While offloaded callbacks are pending,
+    the other non-suppressing handlers queue behind them on the same worker,
+    so their inputs reach the state machine in key order. Once its callbacks
+    fit the budget again for RECALL_AFTER runs, the handler is recalled to
+    the hook.
+    """
+
+    _instance: "KeyboardDispatcher | None" = None
+
+    def __new__(cls, *args, **kwargs):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self, backend: KeyboardBackend | None = None):
+        if self._initialized:
+            return
+        self.backend = backend or default_keyboard_backend()
+        self._handlers: list["HotkeyHandler"] = []
+        self._table: dict[int, tuple["HotkeyHandler", ...]] = {}
+        self._profiles: tuple[Profile, ...] = ()
+        # overrides key (see _overrides_key) -> table
+        self._tables: dict[frozenset, dict[int, tuple["HotkeyHandler", ...]]] = {}
+        self._active: frozenset = frozenset()
+        self._unhook = None
+        self.last_event_ns = 0              # read by the hook watchdog
+        self._lock = threading.Lock()       # serialises writers only
+        self._hooks = REGISTRY.counter("hotkey.hooks_installed")
+        self._rebinds = REGISTRY.counter("hotkey.rebinds")
+        self._overruns = REGISTRY.counter("hotkey.overruns")
+        self._overrun_time = REGISTRY.histogram("hotkey.overrun")
+        self._work: SimpleQueue = SimpleQueue()
+        self._worker: threading.Thread | None = None
+        self._queued = 0                    # written by the hook thread only
+        self._done = 0                      # written by the worker only
+        self.update_config()
+
+        self._initialized = True
+
+    def update_config(self):
+        self.budget_ns = int(Config().snapshot.HOOK_BUDGET_MS * 1e6)
+
+    def register(self, handler: "HotkeyHandler"):
+        with self._lock:
+            if handler not in self._handlers:
+                self._handlers.append(handler)
+            self._rebuild()
+
+    def unregister(self, handler: "HotkeyHandler"):
+        with self._lock:
+            if handler in self._handlers:
+                self._handlers.remove(handler)
+            self._rebuild()
+
+    def rebind(self):
+        with self._lock:
+            self._rebuild()
+
+    def compile(self, profiles):
+        """Prebuild a table for each profile."""
+        with self._lock:
+            self._profiles = tuple(profiles)
+            if not {_overrides_key(p) for p in self._profiles} <= self._tables.keys():
+                self._rebuild()
+
+    def use_profile(self, profile: Profile):
+        key = _overrides_key(profile)
+        with self._lock:
+            if key not in self._tables:
+                self._profiles += (profile,)
+                self._rebuild()
+            self._active = key
+            self._table = self._tables[key]
+
+    def handles(self, scan_code: int) -> bool:
+        """Whether the active table binds `scan_code`."""
+        return scan_code in self._table
+
+    def start(self):
+        if self._unhook is None:
+            self._unhook = self.backend.hook(self._dispatch, suppress=True)
+            self._hooks.inc()
+
+    def stop(self):
+        if self._unhook is not None:
+            self._unhook()
+            self._unhook = None
+        if self._worker is not None:
+            self._work.put(None)
+            self._worker.join(timeout=1)
+            self._worker = None
+
+    def probe(self) -> bool:
+        return self._unhook is not None and self.backend.probe()
+
+    def last_input_ns(self) -> int | None:
+        return self.backend.last_input_ns()
+
+    def reinstall(self):
+        # the OS hook is replaced under the same callback and tables
+        with self._lock:
+            if self._unhook is not None:
+                self.backend.reinstall()
+                self._hooks.inc()
+
+    def overrun(self, handler: "HotkeyHandler", elapsed_ns: int, streak: int):
+        self._overruns.inc()
+        self._overrun_time.record(elapsed_ns)
+        if handler.offloaded or streak < OFFLOAD_AFTER:
+            return
+        if handler.suppress:
+            # the suppress decision has to be made in the hook
+            if not handler._overran:
+                logger.warning("%s callback keeps overrunning the hook budget "
+                               "(%.2f ms > %.2f ms)",
+                               handler.hotkey, elapsed_ns / 1e6, self.budget_ns / 1e6)
+        else:
+            handler.offloaded = True
+            logger.warning("%s callback keeps overrunning the hook budget "
+                           "(%.2f ms > %.2f ms); running it on the worker from now on",
+                           handler.hotkey, elapsed_ns / 1e6, self.budget_ns / 1e6)
+        handler._overran = True
+
+    def busy(self) -> bool:
+        """Offloaded callbacks are still queued or running."""
+        return self._queued != self._done
+
+    def offload(self, handler: "HotkeyHandler", callback, event):
+        if self._worker is None:
+            self._worker = threading.Thread(
+                target=self._run_worker, name="hotkey-worker", daemon=True)
+            self._worker.start()
+        self._queued += 1
+        self._work.put((handler, callback, event))
+
+    def _run_worker(self):
+        while True:
+            item = self._work.get()
+            if item is None:
+                break
+            handler, callback, event = item
+            start = perf_counter_ns()
+            try:
+                callback(event)
+            except Exception as e:
+                logger.exception("Error in offloaded hotkey callback: %s", e)
+            finally:
+                self._done += 1
+            if handler.offloaded:
+                self._recall(handler, perf_counter_ns() - start)
+
+    def _recall(self, handler: "HotkeyHandler", elapsed_ns: int):
+        # worker thread: bring a handler back once it fits the budget again
+        if elapsed_ns > self.budget_ns:
+            handler._calm = 0
+            return
+        handler._calm += 1
+        if handler._calm >= RECALL_AFTER:
+            handler._calm = 0
+            handler._overran = False
+            handler._streaks = [0, 0]
+            handler.offloaded = False
+            logger.info("%s callback is back within the hook budget; "
+                        "running it in the hook again", handler.hotkey)
+
+    def _build_table(self, overrides: dict[str, int]) -> dict[int, tuple["HotkeyHandler", ...]]:
+        table: dict[int, tuple[HotkeyHandler, ...]] = {}
+        for handler in self._handlers:
+            scan_code = overrides.get(handler.hotkey, handler.scan_code)
+            if scan_code is not None:
+                table[scan_code] = table.get(scan_code, ()) + (handler,)
+        return table
+
+    def _rebuild(self):
+        tables = {_overrides_key(profile): self._build_table(profile.scan_codes)
+                  for profile in self._profiles}
+        if self._active not in tables:
+            self._active = next(iter(tables), frozenset())
+            tables.setdefault(self._active, self._build_table({}))
+        self._tables = tables
+        self._table = tables[self._active]
+        self._rebinds.inc()
+        if any(tables.values()):
+            self.start()
+
+    def _dispatch(self, event) -> bool:
+        # runs inside the OS hook: return False only to swallow the key
+        self.last_event_ns = monotonic_ns()
+        handlers = self._table.get(event.scan_code)
+        if not handlers:
+            return True
+        allow = True
+        try:
+            if event.event_type == KEY_DOWN:
+                for handler in handlers:
+                    if not handler._wrap_press(event) and handler.suppress:
+                        allow = False
+            else:
+                for handler in handlers:
+                    if not handler._wrap_release(event) and handler.suppress:
+                        allow = False
+        except Exception as e:
+            logger.exception("Error in hotkey dispatch: %s", e)
+            return True
+        return allow
+
+
+def _overrides_key(profile: Profile) -> frozenset:
+    """Profiles with the same scan-code overrides share a table."""
+    return frozenset(profile.scan_codes.items())
+
 
 class HotkeyHandler:
-    _initialized = False
+    """One entry in the dispatch table, bound to the scan code stored in the
+    config field `hotkey`.
 
-    def __init__(self, hotkey: str, on_press=None, on_release=None):
+    :param suppress:      let on_press/on_release swallow the key by
+                          returning False.
+    :param filter_repeat: ignore auto-repeat presses until the key is released.
+    :param offload:       run the callbacks on the dispatcher's worker and
+                          always let the key through; set automatically
+                          when a non-suppressing callback keeps overrunning
+                          the hook budget, and cleared once it fits again.
+    """
+
+    def __init__(self, hotkey: str, on_press=None, on_release=None,
+                 backend: KeyboardBackend | None = None,
+                 suppress: bool = False, filter_repeat: bool = True,
+                 offload: bool = False):
         self.config = Config()
+        self.dispatcher = KeyboardDispatcher(backend)
         self.hotkey = hotkey
+        self.suppress = suppress
+        self.filter_repeat = filter_repeat
+        self.offloaded = offload and not suppress
+        self._overran = False
+        self._streaks = [0, 0]      # consecutive overruns: press, release
+        self._calm = 0              # consecutive on-budget runs while offloaded
         self._held = False
         self.on_press = on_press
         self.on_release = on_release
-        self._press_hook = None
-        self._release_hook = None
+        self.scan_code = None
+        self._press_time = REGISTRY.histogram(f"hotkey.{hotkey}.press")
+        self._release_time = REGISTRY.histogram(f"hotkey.{hotkey}.release")
         self.update_config()
 
     @handle_errors
     def update_config(self):
-        # Unhook only this handler's hooks
-        if self._press_hook:
-            self._press_hook()
-            self._press_hook = None
         # Use scan code
-        if hasattr(self.config, self.hotkey):
-            self.scan_code = getattr(self.config, self.hotkey)
-        else:
-            self.scan_code = None
+        self.scan_code = getattr(self.config.snapshot, self.hotkey, None)
+        self._held = False
         self.start()
 
     @handle_errors
     def start(self):
-        logger.debug(
-            f"Starting hotkey handler for {self.hotkey} with scan code {self.scan_code}")
-        if self.scan_code is None:
-            return
-        must_block = self.hotkey == "SPACE_HOTKEY_SC"
-        self._press_hook = on_press_key(
-            self.scan_code,   self._wrap_press,   suppress=must_block)
-        self._release_hook = on_release_key(
-            self.scan_code, self._wrap_release, suppress=must_block)
+        logger.debug("Starting hotkey handler for %s with scan code %s",
+                     self.hotkey, self.scan_code)
+        self.dispatcher.register(self)
+
+    def stop(self):
+        self.dispatcher.unregister(self)
 
     def _wrap_press(self, event):
-        if not self._held:
-            self._held = True
-            if self.on_press:                    # might return True / False
-                return bool(self.on_press(event)) if self.on_press else True
-        return False                              # let it through otherwise
+        start = perf_counter_ns()
+        try:
+            if not (self._held and self.filter_repeat):
+                self._held = True
+                if self.on_press and self._deferred():
+                    self.dispatcher.offload(self, self.on_press, event)
+                    return True
+                if self.on_press:                    # might return True / False
+                    return bool(self.on_press(event)) if self.on_press else True
+            return False                              # let it through otherwise
+        finally:
+            self._timed(self._press_time, start, 0)
 
     def _wrap_release(self, event):
-        self._held = False
-        if self.on_release:
-            return bool(self.on_release(event)) if self.on_release else True
-        return True
+        start = perf_counter_ns()
+        try:
+            self._held = False
+            if self.on_release and self._deferred():
+                self.dispatcher.offload(self, self.on_release, event)
+                return True
+            if self.on_release:
+                return bool(self.on_release(event)) if self.on_release else True
+            return True
+        finally:
+            self._timed(self._release_time, start, 1)
+
+    def _deferred(self) -> bool:
+        # queue behind pending offloaded callbacks to keep key order
+        return self.offloaded or (not self.suppress and self.dispatcher.busy())
+
+    def _timed(self, histogram, start: int, slot: int):
+        elapsed = perf_counter_ns() - start
+        histogram.record(elapsed)
+        if elapsed > self.dispatcher.budget_ns:
+            self._streaks[slot] += 1
+            self.dispatcher.overrun(self, elapsed, self._streaks[slot])
+        elif self._streaks[slot]:
+            self._streaks[slot] = 0
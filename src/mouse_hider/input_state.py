@@ -0,0 +1,170 @@
+import logging
+import threading
+from enum import Enum, auto
+from queue import SimpleQueue
+from time import perf_counter_ns
+from typing import Callable
+
+from .metrics import REGISTRY
+from .mouse_freezer import MouseFreezer
+
+logger = logging.getLogger(__name__)
+
+
+class Mode(Enum):
+    NORMAL = auto()
+    CAM7 = auto()       # cursor released for the game camera; Space → right-click
+
+
+class Input(Enum):
+    TOGGLE = auto()         # activation hotkey
+    ENTER_CAM7 = auto()     # deactivation hotkey
+    EXIT_CAM7 = auto()      # Q / E
+    SPACE_DOWN = auto()
+    SPACE_UP = auto()
+    FOCUS_LOSS = auto()
+
+
+# inputs that are dropped at the hook unless the game has focus
+_NEEDS_FOCUS = frozenset({Input.TOGGLE, Input.ENTER_CAM7, Input.EXIT_CAM7})
+
+_STOP = object()
+
+
+class InputStateMachine:
+    """cam-7 mode and the Space remap as an actor.
+
+    Hook and focus threads only call post(); a single consumer thread
+    applies the transitions in the order they were posted. `mode` and the
+    Space flags are written by that thread alone.
+
+    The consumer can be behind the queue, so the hook does not read `mode`
+    to decide whether to swallow Space. post() advances `hook_mode` through
+    the same table as each input is enqueued, which gives the mode after
+    every input posted so far.
+    """
+
+    def __init__(self, freezer: MouseFreezer, is_focused: Callable[[], bool]):
+        self.freezer = freezer
+        self.is_focused = is_focused
+        self.mode = Mode.NORMAL
+        self.hook_mode = Mode.NORMAL    # mode once the queue has drained
+        self.space_translated = False   # Space currently held as right-click
+        self.space_down = False         # Space key physically down
+        self._space_swallowed = False   # hook thread only
+        self._post_lock = threading.Lock()  # hook_mode and queue order agree
+        self._queue: SimpleQueue = SimpleQueue()
+        self._put = self._queue.put     # swapped by run_async()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._queue_delay = REGISTRY.histogram("input.queue_delay")
+        self._transition_time = REGISTRY.histogram("input.transition")
+
+        # (mode, input) -> (action, next mode)
+        self._table: dict[tuple[Mode, Input], tuple[Callable[[object], None], Mode]] = {
+            (Mode.NORMAL, Input.TOGGLE):     (self._toggle, Mode.NORMAL),
+            (Mode.CAM7,   Input.TOGGLE):     (self._toggle, Mode.NORMAL),
+            (Mode.NORMAL, Input.ENTER_CAM7): (self._unfreeze, Mode.CAM7),
+            (Mode.CAM7,   Input.ENTER_CAM7): (self._unfreeze, Mode.CAM7),
+            (Mode.NORMAL, Input.EXIT_CAM7):  (self._exit_cam7, Mode.NORMAL),
+            (Mode.CAM7,   Input.EXIT_CAM7):  (self._exit_cam7, Mode.NORMAL),
+            (Mode.NORMAL, Input.SPACE_DOWN): (self._space_down, Mode.NORMAL),
+            (Mode.CAM7,   Input.SPACE_DOWN): (self._space_down, Mode.CAM7),
+            (Mode.NORMAL, Input.SPACE_UP):   (self._space_up, Mode.NORMAL),
+            (Mode.CAM7,   Input.SPACE_UP):   (self._space_up, Mode.CAM7),
+            (Mode.NORMAL, Input.FOCUS_LOSS): (self._unfreeze, Mode.NORMAL),
+            (Mode.CAM7,   Input.FOCUS_LOSS): (self._unfreeze, Mode.CAM7),
+        }
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._queue.put(_STOP)
+        self._thread.join(timeout=1)
+
+    def post(self, event: Input, arg: object = None):
+        with self._post_lock:
+            self.hook_mode = self._table[(self.hook_mode, event)][1]
+            self._put((event, arg, perf_counter_ns()))
+
+    # ---------- hook-side helpers: decide, enqueue, return ----------
+    def on_key(self, event: Input):
+        if event not in _NEEDS_FOCUS or self.is_focused():
+            self.post(event)
+
+    def on_space_press(self) -> bool:
+        """Returns False to swallow Space when it becomes a right-click."""
+        translate = self.hook_mode is Mode.CAM7 and self.is_focused()
+        self._space_swallowed = translate
+        self.post(Input.SPACE_DOWN, translate)
+        return not translate
+
+    def on_space_release(self) -> bool:
+        swallowed, self._space_swallowed = self._space_swallowed, False
+        self.post(Input.SPACE_UP)
+        return not swallowed
+
+    # ---------- consumer ------------------------------------------
+    async def run_async(self):
+        """Asyncio variant of the consumer thread; runs until cancelled."""
+        import asyncio
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        self._put = lambda item: loop.call_soon_threadsafe(queue.put_nowait, item)
+        while not self._queue.empty():      # posted before the loop took over
+            queue.put_nowait(self._queue.get_nowait())
+        try:
+            while True:
+                self._handle(await queue.get())
+        finally:
+            self._put = self._queue.put
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                return
+            self._handle(item)
+
+    def _handle(self, item):
+        event, arg, posted = item
+        start = perf_counter_ns()
+        self._queue_delay.record(start - posted)
+        action, next_mode = self._table[(self.mode, event)]
+        try:
+            action(arg)
+        except Exception as e:
+            logger.exception("Error handling %s: %s", event.name, e)
+        self.mode = next_mode
+        self._transition_time.since(start)
+
+    def _release_translated(self):
+        if self.space_translated:          # key still held → release
+            self.freezer.mouse.release("right")
+            self.space_translated = False
+
+    def _toggle(self, _):
+        self.freezer.toggle()
+        self._release_translated()
+
+    def _unfreeze(self, _):
+        self.freezer.unfreeze()
+
+    def _exit_cam7(self, _):
+        self.freezer.freeze()
+        self._release_translated()
+        if self.space_down:                # key itself still down → release
+            self.freezer.mouse.release("right")
+            self.space_down = False
+
+    def _space_down(self, translate):
+        self.space_down = True
+        if translate:
+            self.freezer.mouse.press("right")
+            self.space_translated = True
+
+    def _space_up(self, _):
+        self.space_down = False
+        if self.space_translated:
+            self.freezer.mouse.release("right")
+            self.space_translated = False
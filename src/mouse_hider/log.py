@@ -0,0 +1,134 @@
+import atexit
+import logging
+import threading
+from collections import deque
+from queue import SimpleQueue
+
+LOG_FORMAT = "%(asctime)s %(levelname)s %(name)s: %(message)s"
+DATE_FORMAT = "%H:%M:%S"
+RING_CAPACITY = 2000            # records kept for dump_recent()
+LOG_MAX_BYTES = 512 * 1024      # run.log rotation
+LOG_BACKUPS = 3
+
+_STOP = None
+
+
+class RingBufferHandler(logging.Handler):
+    """Keeps the last `capacity` records in memory, formatted only when
+    dumped."""
+
+    def __init__(self, capacity: int = RING_CAPACITY):
+        super().__init__(logging.DEBUG)
+        self.records: deque[logging.LogRecord] = deque(maxlen=capacity)
+
+    def emit(self, record: logging.LogRecord):
+        self.records.append(record)
+
+    def dump(self, path: str) -> int:
+        """Write the buffered records to `path`; returns how many."""
+        records = list(self.records)
+        with open(path, "w", encoding="utf-8") as f:
+            for record in records:
+                f.write(self.format(record) + "\n")
+        logging.getLogger(__name__).info("%d recent log records written to %s",
+                                         len(records), path)
+        return len(records)
+
+
+class _QueueHandler(logging.Handler):
+    """Only enqueues: the record is formatted (its %-args merged) by the
+    listener thread, not in the hook callback that logged."""
+
+    def __init__(self, queue: SimpleQueue):
+        super().__init__()
+        self.queue = queue
+
+    def emit(self, record: logging.LogRecord):
+        self.queue.put(record)
+
+
+class _Listener:
+    """Drains the queue into the real handlers on a daemon thread.
+
+    The rotating file handler is opened on that thread too, so
+    logging.handlers (which pulls in socket and pickle) never costs the
+    main thread startup time.
+    """
+
+    def __init__(self, queue: SimpleQueue, handlers: list[logging.Handler],
+                 formatter: logging.Formatter, log_file: str | None):
+        self.queue = queue
+        self.handlers = handlers
+        self.formatter = formatter
+        self.log_file = log_file
+        self._thread = threading.Thread(target=self._run, name="log", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self.queue.put(_STOP)
+        self._thread.join()
+
+    def _open_log_file(self):
+        from logging.handlers import RotatingFileHandler
+        try:
+            handler = RotatingFileHandler(
+                self.log_file, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUPS,
+                encoding="utf-8")
+        except OSError as e:
+            logging.getLogger(__name__).warning("Cannot open %s: %s", self.log_file, e)
+            return
+        handler.setFormatter(self.formatter)
+        self.handlers.append(handler)
+
+    def _run(self):
+        if self.log_file:
+            self._open_log_file()
+        while True:
+            record = self.queue.get()
+            if record is _STOP:
+                break
+            for handler in self.handlers:
+                if record.levelno >= handler.level:
+                    handler.handle(record)
+        for handler in self.handlers:
+            handler.flush()
+
+
+_listener: _Listener | None = None
+
+RING = RingBufferHandler()
+
+
+def setup_logging(level: int = logging.DEBUG, log_file: str | None = None):
+    """Route the root logger through a queue: callers only enqueue, and one
+    background thread formats for the console, `log_file` (rotated by size)
+    and the in-memory RING."""
+    global _listener
+    if _listener is not None:
+        return
+    formatter = logging.Formatter(LOG_FORMAT, DATE_FORMAT)
+    handlers: list[logging.Handler] = [logging.StreamHandler(), RING]
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    queue: SimpleQueue = SimpleQueue()
+    root = logging.getLogger()
+    root.setLevel(level)
+    root.addHandler(_QueueHandler(queue))
+    _listener = _Listener(queue, handlers, formatter, log_file)
+    _listener.start()
+    atexit.register(stop_logging)
+
+
+def stop_logging():
+    """Write out everything still queued and stop the listener thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def dump_recent(path: str) -> int:
+    return RING.dump(path)
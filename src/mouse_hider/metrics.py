@@ -0,0 +1,124 @@
+import json
+import logging
+from bisect import bisect_right
+from time import monotonic, perf_counter_ns
+
+logger = logging.getLogger(__name__)
+
+# Recording is lock-free: metrics are fetched once at setup time and the hot
+# path only does integer arithmetic. Concurrent writers to the same metric
+# can lose an increment, which is acceptable for instrumentation.
+
+# histogram bucket upper bounds in ns: 1 µs, 2 µs, 4 µs … ~1 s
+_BOUNDS = tuple(1_000 << i for i in range(21))
+
+
+class Counter:
+    __slots__ = ("name", "value")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.value = 0
+
+    def inc(self, n: int = 1):
+        self.value += n
+
+
+class Histogram:
+    __slots__ = ("name", "counts", "count", "total", "max")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.counts = [0] * (len(_BOUNDS) + 1)
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def record(self, ns: int):
+        self.counts[bisect_right(_BOUNDS, ns)] += 1
+        self.count += 1
+        self.total += ns
+        if ns > self.max:
+            self.max = ns
+
+    def since(self, start_ns: int):
+        self.record(perf_counter_ns() - start_ns)
+
+    def percentile(self, q: float) -> int:
+        """Upper bound (ns) of the bucket holding the q-th sample."""
+        if not self.count:
+            return 0
+        target = q * self.count
+        seen = 0
+        for i, n in enumerate(list(self.counts)):
+            seen += n
+            if seen >= target and n:
+                return min(_BOUNDS[i], self.max) if i < len(_BOUNDS) else self.max
+        return self.max
+
+    def snapshot(self) -> dict:
+        return {
+            "count": self.count,
+            "mean_us": self.total / self.count / 1e3 if self.count else 0.0,
+            "p50_us": self.percentile(0.50) / 1e3,
+            "p99_us": self.percentile(0.99) / 1e3,
+            "max_us": self.max / 1e3,
+        }
+
+
+class Registry:
+
+    def __init__(self):
+        self.started = monotonic()
+        self._counters: dict[str, Counter] = {}
+        self._histograms: dict[str, Histogram] = {}
+
+    def counter(self, name: str) -> Counter:
+        if name not in self._counters:
+            self._counters[name] = Counter(name)
+        return self._counters[name]
+
+    def histogram(self, name: str) -> Histogram:
+        if name not in self._histograms:
+            self._histograms[name] = Histogram(name)
+        return self._histograms[name]
+
+    def snapshot(self) -> dict:
+        elapsed = monotonic() - self.started
+        return {
+            "uptime_s": elapsed,
+            "counters": {
+                name: {"value": c.value,
+                       "rate_per_s": c.value / elapsed if elapsed > 0 else 0.0}
+                for name, c in sorted(self._counters.items())
+            },
+            "histograms": {
+                name: h.snapshot() for name, h in sorted(self._histograms.items())
+            },
+        }
+
+    def dump(self, path: str) -> None:
+        """Write a snapshot as JSON (".json") or as aligned text (anything else)."""
+        snap = self.snapshot()
+        with open(path, "w") as f:
+            if path.endswith(".json"):
+                json.dump(snap, f, indent=4)
+            else:
+                f.write(self.format(snap))
+        logger.info("Metrics written to %s", path)
+
+    @staticmethod
+    def format(snap: dict) -> str:
+        lines = [f"uptime {snap['uptime_s']:.1f}s", ""]
+        for name, c in snap["counters"].items():
+            lines.append(f"{name:<40} {c['value']:>10} {c['rate_per_s']:>10.2f}/s")
+        lines.append("")
+        lines.append(f"{'histogram':<40} {'count':>8} {'p50 us':>9} "
+                     f"{'p99 us':>9} {'max us':>9}")
+        for name, h in snap["histograms"].items():
+            lines.append(f"{name:<40} {h['count']:>8} {h['p50_us']:>9.1f} "
+                         f"{h['p99_us']:>9.1f} {h['max_us']:>9.1f}")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
@@ -1,77 +1,144 @@
-from threading import Thread
-from time import sleep
 import logging
-from pynput.mouse import Controller, Listener as MouseListener
+from time import perf_counter_ns
 
 from .config import Config
+from .backends.confine import ConfineBackend, default_confine_backend
+from .backends.mouse import MouseBackend, default_mouse_backend
+from .metrics import REGISTRY
+from .profiles import Profile
+from .scheduler import Job, Scheduler
 
 logger = logging.getLogger(__name__)
 
 
 class MouseFreezer:
-    
+    """Holds the cursor on FROZEN_COORDS while frozen.
+
+    POSITION_MODE "confine" clips the cursor at OS level and needs no
+    periodic work; without a confinement backend, or if clipping fails, it
+    falls back to "event" (reposition on movement plus a safety check).
+    """
+
     _instance: "MouseFreezer | None" = None
-    
+
     def __new__(cls, *args, **kwargs):
         if cls._instance is None:
             cls._instance = super().__new__(cls)
             cls._instance._initialized = False
         return cls._instance
-    
-    def __init__(self):
+
+    def __init__(self, mouse: MouseBackend | None = None,
+                 confine: ConfineBackend | None = None):
         if self._initialized:
             return
-        
+
         self.config = Config()
         self.update_config()
         self.freeze_flag = False
-        self.mouse = Controller()
-        self._hook = None
-        self._thread = Thread(target=self._maintain_position, daemon=True)
-        
+        self.mouse = mouse or default_mouse_backend()
+        self.mode = self.config.snapshot.POSITION_MODE
+        if self.mode == "confine":
+            self.confiner = confine or default_confine_backend()
+            if self.confiner is None:
+                self.mode = "event"
+        self._corrections = REGISTRY.counter("freezer.corrections")
+        self._freeze_time = REGISTRY.histogram("freezer.freeze")
+        self._unfreeze_time = REGISTRY.histogram("freezer.unfreeze")
+        self._job: Job | None = None
+
         self._initialized = True
 
     def update_config(self):
-        self.frozen_coords = self.config.FROZEN_COORDS
-        self.unfrozen_coords = self.config.UNFROZEN_COORDS
+        snapshot = self.config.snapshot
+        self.frozen_coords = snapshot.FROZEN_COORDS
+        self.unfrozen_coords = snapshot.UNFROZEN_COORDS
+
+    def use_profile(self, profile: Profile):
+        self.frozen_coords = profile.frozen_coords
+        self.unfrozen_coords = profile.unfrozen_coords
+        if self.freeze_flag and self.mode == "confine":
+            self._confine()
+
+    @property
+    def wakeups(self) -> int:
+        return self._job.ticks if self._job else 0
 
     def start(self):
-        self._thread.start()
+        self.mouse.warm_up()
+        scheduler = Scheduler()
+        if self.mode == "confine":
+            return                      # the OS holds the cursor
+        if self.mode == "poll":
+            self._job = scheduler.register(
+                "freezer.position", self._rewrite_position,
+                lambda: self.config.snapshot.POSITION_CHECK_INTERVAL,
+                paused=not self.freeze_flag)
+        else:
+            # safety check backs off up to 8x while the cursor stays put
+            self._job = scheduler.register(
+                "freezer.position", self._correct,
+                lambda: self.config.snapshot.POSITION_SAFETY_INTERVAL,
+                max_interval=8 * (self.config.snapshot.POSITION_SAFETY_INTERVAL or 0),
+                paused=not self.freeze_flag)
+
+    def stop(self):
+        if self._job:
+            Scheduler().unregister(self._job)
+            self._job = None
+        self.mouse.close()
+
+    def _rewrite_position(self) -> bool:
+        if self.freeze_flag:
+            self.mouse.position = self.frozen_coords
+        return True
+
+    def _correct(self) -> bool:
+        if self.freeze_flag and tuple(self.mouse.position) != self.frozen_coords:
+            self.mouse.position = self.frozen_coords
+            self._corrections.inc()
+            return True
+        return False
 
-    def _maintain_position(self):
-        while True:
+    def _confine(self):
+        try:
+            self.confiner.confine(*self.frozen_coords)
+        except OSError as e:
+            logger.warning("Cursor confinement failed (%s); repositioning instead.", e)
+            self.mode = "event"
+            self.start()
             if self.freeze_flag:
-                self.mouse.position = self.frozen_coords
-            sleep(self.config.POSITION_CHECK_INTERVAL)
-
-    def _start_hook(self):
-        if not self._hook:
-            self._hook = MouseListener(
-                on_move=lambda *a, **k: None,
-                on_click=lambda *a, **k: None,
-                on_scroll=lambda *a, **k: None,
-                suppress=True
-            )
-            self._hook.start()
-
-    def _stop_hook(self):
-        if self._hook:
-            self._hook.stop()
-            self._hook = None
+                self._job.resume()
+
+    def _on_move(self, x, y):
+        # runs on the hook thread: only wake the keeper
+        if self.freeze_flag and self._job:
+            self._job.poke()
 
     def freeze(self):
         if not self.freeze_flag:
+            start = perf_counter_ns()
             self.freeze_flag = True
             self.mouse.position = self.frozen_coords
-            self._start_hook()
-            logger.info(f"Mouse frozen at {self.frozen_coords}.")
+            if self.mode == "confine":
+                self._confine()
+            self.mouse.start_suppressing(self._on_move)
+            if self._job:
+                self._job.resume()
+            self._freeze_time.since(start)
+            logger.info("Mouse frozen at %s.", self.frozen_coords)
 
     def unfreeze(self):
         if self.freeze_flag:
+            start = perf_counter_ns()
             self.freeze_flag = False
-            self._stop_hook()
+            if self._job:
+                self._job.pause()
+            if self.mode == "confine":
+                self.confiner.release()
+            self.mouse.stop_suppressing()
             self.mouse.position = self.unfrozen_coords
-            logger.info(f"Mouse unfrozen; moved to {self.unfrozen_coords}.")
+            self._unfreeze_time.since(start)
+            logger.info("Mouse unfrozen; moved to %s.", self.unfrozen_coords)
 
     def toggle(self):
         if self.freeze_flag:
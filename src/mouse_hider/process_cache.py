@@ -0,0 +1,71 @@
+import logging
+from collections import OrderedDict
+
+from .backends.focus import FocusBackend
+from .metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+
+class ProcessNameCache:
+    """Bounded LRU of pid -> (create_time, lowercase exe name).
+
+    The create time guards against PID reuse. A repeated lookup of the PID
+    that was resolved last is answered from the dict without touching the OS.
+    """
+
+    def __init__(self, backend: FocusBackend, maxsize: int = 64):
+        self.backend = backend
+        self.maxsize = maxsize
+        self._entries: OrderedDict[int, tuple[float, str]] = OrderedDict()
+        self._last_pid: int | None = None
+        self._hits = REGISTRY.counter("focus.name_cache.hits")
+        self._misses = REGISTRY.counter("focus.name_cache.misses")
+
+    def name(self, pid: int) -> str | None:
+        entry = self._entries.get(pid)
+        if entry is not None and pid == self._last_pid:
+            self._hits.inc()
+            return entry[1]
+
+        create_time = self.backend.process_create_time(pid)
+        if create_time is None:             # already exited
+            self._evict(pid)
+            self._misses.inc()
+            return None
+        self._last_pid = pid
+        if entry is not None and entry[0] == create_time:
+            self._entries.move_to_end(pid)
+            self._hits.inc()
+            return entry[1]
+
+        self._misses.inc()
+        name = self.backend.process_name(pid)
+        if name is None:
+            self._evict(pid)
+            return None
+        name = name.lower()
+        self._entries[pid] = (create_time, name)
+        self._entries.move_to_end(pid)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+        return name
+
+    def prune(self) -> int:
+        """Drop entries whose process has exited or whose PID was reused."""
+        dead = [
+            pid for pid, (create_time, _) in list(self._entries.items())
+            if self.backend.process_create_time(pid) != create_time
+        ]
+        for pid in dead:
+            self._evict(pid)
+        return len(dead)
+
+    def clear(self):
+        self._entries.clear()
+        self._last_pid = None
+
+    def _evict(self, pid: int):
+        self._entries.pop(pid, None)
+        if self._last_pid == pid:
+            self._last_pid = None
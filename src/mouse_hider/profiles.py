@@ -0,0 +1,59 @@
+import logging
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# config fields a profile may override
+COORD_FIELDS = ("FROZEN_COORDS", "UNFROZEN_COORDS")
+HOTKEY_FIELDS = ("HOTKEY_SC", "DEACTIVATION_HOTKEY_SC", "SPACE_HOTKEY_SC",
+                 "Q_SCAN_CODE", "E_SCAN_CODE")
+PROFILE_FIELDS = COORD_FIELDS + HOTKEY_FIELDS
+
+
+class Profile:
+    """Settings for one game, resolved once when the config changes.
+
+    `scan_codes` holds only the hotkeys this profile overrides; the others
+    fall back to the top-level config, which is what HotkeyHandler reads.
+    """
+
+    __slots__ = ("exe_name", "frozen_coords", "unfrozen_coords", "scan_codes")
+
+    def __init__(self, exe_name: str, frozen_coords: tuple[int, int],
+                 unfrozen_coords: tuple[int, int], scan_codes: dict[str, int]):
+        self.exe_name = exe_name
+        self.frozen_coords = frozen_coords
+        self.unfrozen_coords = unfrozen_coords
+        self.scan_codes = scan_codes
+
+    def __eq__(self, other):
+        if not isinstance(other, Profile):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __repr__(self):
+        return f"Profile({self.exe_name!r})"
+
+
+def _compile(exe_name: str, config, overrides: dict[str, Any]) -> Profile:
+    unknown = set(overrides) - set(PROFILE_FIELDS)
+    if unknown:
+        logger.warning("Profile %s: ignoring unknown keys %s", exe_name, sorted(unknown))
+    return Profile(
+        exe_name,
+        tuple(overrides.get("FROZEN_COORDS", config.FROZEN_COORDS)),
+        tuple(overrides.get("UNFROZEN_COORDS", config.UNFROZEN_COORDS)),
+        {name: overrides[name] for name in HOTKEY_FIELDS if name in overrides},
+    )
+
+
+def compile_profiles(config) -> dict[str, Profile]:
+    """Lowercase exe name -> Profile, from a ConfigSnapshot (or Config).
+
+    GAME_EXE_NAME with the top-level fields is always a profile; each entry
+    in PROFILES adds another, overriding any of PROFILE_FIELDS.
+    """
+    entries = {exe_name.lower(): overrides for exe_name, overrides in config.PROFILES.items()}
+    entries.setdefault(config.GAME_EXE_NAME.lower(), {})
+    return {exe_name: _compile(exe_name, config, overrides)
+            for exe_name, overrides in entries.items()}
@@ -0,0 +1,117 @@
+import logging
+import threading
+from time import perf_counter_ns
+
+from . import main, main_async
+from .config import flush_config, reload_config
+from .metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+RESTART_TIMEOUT = 5.0   # seconds for the old run to stop and the new one to arm
+
+
+class _Runtime:
+    """Start, stop and hot restart for a background runtime.
+
+    restart() stops the running components, which tears down their
+    singletons, re-reads config.json and builds everything again in this
+    process. The Qt app and the interpreter stay up.
+    """
+
+    def __init__(self, **backends):
+        self._backends = backends
+        self._thread: threading.Thread | None = None
+        self._restart_lock = threading.Lock()
+        self._restart_time = REGISTRY.histogram("runtime.restart")
+        self.hooks_ready = threading.Event()     # set while the hooks are live
+
+    def start(self):
+        self.hooks_ready.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 1.0):
+        raise NotImplementedError
+
+    def is_alive(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def join(self, timeout: float | None = None):
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def restart(self) -> float:
+        """Rebuild every component in-process; returns the time taken in ms."""
+        with self._restart_lock:
+            start = perf_counter_ns()
+            self.stop(RESTART_TIMEOUT)
+            if self.is_alive():
+                raise RuntimeError("background runtime did not stop")
+            flush_config()              # don't lose a pending GUI edit
+            changed = reload_config()
+            self.start()
+            if not self.hooks_ready.wait(RESTART_TIMEOUT):
+                raise RuntimeError("hooks not ready after restart")
+            self._restart_time.since(start)
+            elapsed_ms = (perf_counter_ns() - start) / 1e6
+            logger.info("Hot restart took %.1f ms (config changes: %s)",
+                        elapsed_ms, ", ".join(changed) or "none")
+            return elapsed_ms
+
+    def _run(self):
+        raise NotImplementedError
+
+
+class ThreadRuntime(_Runtime):
+    """Hosts `main()` on a worker thread; the components start their own."""
+
+    def start(self):
+        self._stop_event = threading.Event()
+        super().start()
+
+    def stop(self, timeout: float = 1.0):
+        self._stop_event.set()
+        self.join(timeout)
+
+    def _run(self):
+        main(self._stop_event, self.hooks_ready, **self._backends)
+
+
+class AsyncRuntime(_Runtime):
+    """Hosts `main_async()` on a single asyncio loop.
+
+    The focus watcher, cursor keeper, config writer and input state machine
+    share this one thread instead of one thread each. The Qt thread only
+    talks to it through thread-safe calls; stop() is a task cancel, which
+    the loop processes on its next iteration.
+    """
+
+    def start(self):
+        import asyncio
+
+        self.loop = asyncio.new_event_loop()
+        self._task: "asyncio.Task | None" = None
+        self._created = threading.Event()
+        super().start()
+        self._created.wait()
+
+    def stop(self, timeout: float = 1.0):
+        if self._task and not self.loop.is_closed():
+            self.loop.call_soon_threadsafe(self._task.cancel)
+        self.join(timeout)
+
+    def _run(self):
+        import asyncio
+
+        asyncio.set_event_loop(self.loop)
+        self._task = self.loop.create_task(main_async(self.hooks_ready, **self._backends))
+        self._created.set()
+        try:
+            self.loop.run_until_complete(self._task)
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            logger.exception("Async runtime failed: %s", e)
+        finally:
+            self.loop.close()
@@ -0,0 +1,240 @@
+import logging
+import threading
+from time import monotonic
+from typing import Callable
+
+logger = logging.getLogger(__name__)
+
+Interval = float | Callable[[], float] | None
+
+
+class Job:
+    """A periodic job owned by the Scheduler.
+
+    `fn()` returns True when it saw activity: the job snaps back to its
+    base interval. A False return multiplies the interval by `backoff`, up
+    to `max_interval`. A base interval of None or 0 means the job only
+    runs when poked. A `blocking` job (file or hook I/O) runs on an
+    executor thread under run_async(), so it never stalls the loop.
+    """
+
+    def __init__(self, scheduler: "Scheduler", name: str, fn: Callable[[], bool],
+                 interval: Interval, max_interval: float | None, backoff: float,
+                 paused: bool, blocking: bool):
+        self.scheduler = scheduler
+        self.name = name
+        self.fn = fn
+        self._interval = interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.paused = paused
+        self.blocking = blocking
+        self.current = self.base_interval()
+        self.next_run: float | None = None
+        self.ticks = 0
+        self.registered_at = monotonic()
+        self._running = False
+        self._poked = False
+        if not paused:
+            self._schedule(monotonic())
+
+    def base_interval(self) -> float | None:
+        interval = self._interval() if callable(self._interval) else self._interval
+        return interval or None
+
+    def poke(self):
+        """Run as soon as possible and return to the base rate."""
+        with self.scheduler._cond:
+            if self.paused:
+                return
+            self.current = self.base_interval()
+            if self._running:
+                self._poked = True
+            else:
+                self.next_run = monotonic()
+                self.scheduler._notify()
+
+    def pause(self):
+        with self.scheduler._cond:
+            self.paused = True
+            self.next_run = None
+
+    def resume(self):
+        with self.scheduler._cond:
+            if not self.paused:
+                return
+            self.paused = False
+            self.current = self.base_interval()
+            if not self._running:
+                self._schedule(monotonic())
+                self.scheduler._notify()
+
+    def stats(self) -> dict:
+        elapsed = monotonic() - self.registered_at
+        return {
+            "ticks": self.ticks,
+            "interval": self.current,
+            "paused": self.paused,
+            "rate_hz": self.ticks / elapsed if elapsed > 0 else 0.0,
+        }
+
+    def _schedule(self, now: float):
+        self.next_run = None if self.current is None else now + self.current
+
+    def _finished(self, active: bool, now: float):
+        self._running = False
+        self.ticks += 1
+        base = self.base_interval()
+        if active or base is None or self.current is None:
+            self.current = base
+        else:
+            ceiling = self.max_interval or base
+            self.current = min(max(self.current * self.backoff, base), ceiling)
+        if self.paused:
+            self.next_run = None
+        elif self._poked:
+            self._poked = False
+            self.next_run = now
+        else:
+            self._schedule(now)
+
+
+class Scheduler:
+    """One thread that runs every registered periodic job."""
+
+    _instance: "Scheduler | None" = None
+
+    def __new__(cls, *args, **kwargs):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self):
+        if self._initialized:
+            return
+        self._cond = threading.Condition()
+        self._jobs: list[Job] = []
+        self._thread: threading.Thread | None = None
+        self._stopped = False
+        self._async_wake: Callable[[], None] | None = None
+
+        self._initialized = True
+
+    def register(self, name: str, fn: Callable[[], bool], interval: Interval,
+                 max_interval: float | None = None, backoff: float = 2.0,
+                 paused: bool = False, blocking: bool = False) -> Job:
+        with self._cond:
+            job = Job(self, name, fn, interval, max_interval, backoff, paused, blocking)
+            self._jobs.append(job)
+            self._notify()
+        return job
+
+    def unregister(self, job: Job):
+        with self._cond:
+            if job in self._jobs:
+                self._jobs.remove(job)
+            job.next_run = None
+
+    def start(self):
+        with self._cond:
+            if self._thread and self._thread.is_alive():
+                return
+            self._stopped = False
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        with self._cond:
+            self._stopped = True
+            self._cond.notify()
+        if self._thread:
+            self._thread.join(timeout=1)
+            self._thread = None
+
+    def stats(self) -> dict[str, dict]:
+        with self._cond:
+            return {job.name: job.stats() for job in self._jobs}
+
+    def _notify(self):
+        # caller holds self._cond
+        self._cond.notify()
+        if self._async_wake:
+            self._async_wake()
+
+    def _take_due(self) -> tuple[list[Job], float | None]:
+        """Mark due jobs as running; otherwise return the time to wait."""
+        now = monotonic()
+        due = [j for j in self._jobs if j.next_run is not None and j.next_run <= now]
+        if due:
+            for job in due:
+                job.next_run = None
+                job._running = True
+            return due, None
+        pending = [j.next_run for j in self._jobs if j.next_run is not None]
+        return due, min(pending) - now if pending else None
+
+    @staticmethod
+    def _finish(results: list[tuple[Job, bool]]):
+        now = monotonic()
+        for job, active in results:
+            job._finished(active, now)
+
+    def _run(self):
+        with self._cond:
+            while not self._stopped:
+                due, timeout = self._take_due()
+                if not due:
+                    self._cond.wait(timeout)
+                    continue
+                self._cond.release()
+                try:
+                    results = [(job, self._call(job)) for job in due]
+                finally:
+                    self._cond.acquire()
+                self._finish(results)
+
+    async def run_async(self):
+        """Asyncio variant of the scheduler thread; runs until cancelled."""
+        import asyncio
+        loop = asyncio.get_running_loop()
+        wake = asyncio.Event()
+        with self._cond:
+            self._async_wake = lambda: loop.call_soon_threadsafe(wake.set)
+        try:
+            while True:
+                with self._cond:
+                    due, timeout = self._take_due()
+                if not due:
+                    try:
+                        await asyncio.wait_for(wake.wait(), timeout)
+                    except asyncio.TimeoutError:
+                        pass
+                    wake.clear()
+                    continue
+                for job in due:
+                    if job.blocking:
+                        future = loop.run_in_executor(None, self._call, job)
+                        future.add_done_callback(
+                            lambda f, job=job: self._finish_blocking(job, f))
+                results = [(job, self._call(job)) for job in due if not job.blocking]
+                with self._cond:
+                    self._finish(results)
+        finally:
+            with self._cond:
+                self._async_wake = None
+
+    def _finish_blocking(self, job: Job, future):
+        # runs on the loop once the executor is done with the job
+        active = not future.cancelled() and future.result()
+        with self._cond:
+            self._finish([(job, active)])
+            self._notify()
+
+    @staticmethod
+    def _call(job: Job) -> bool:
+        try:
+            return bool(job.fn())
+        except Exception as e:
+            logger.exception("Error in scheduled job %s: %s", job.name, e)
+            return False
@@ -0,0 +1,144 @@
+import logging
+import sys
+import threading
+from contextlib import contextmanager
+from time import perf_counter_ns
+
+logger = logging.getLogger(__name__)
+
+
+class _TimingLoader:
+    """Wraps a module's real loader for the duration of one import."""
+
+    def __init__(self, loader, profiler: "StartupProfiler"):
+        self._loader = loader
+        self._profiler = profiler
+
+    def __getattr__(self, attr):
+        return getattr(self._loader, attr)
+
+    def create_module(self, spec):
+        with self._profiler._timed(spec.name):
+            return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        try:
+            with self._profiler._timed(module.__name__, count=False):
+                self._loader.exec_module(module)
+        finally:
+            # leave no trace of the wrapper on the imported module
+            module.__loader__ = self._loader
+            if module.__spec__ is not None:
+                module.__spec__.loader = self._loader
+
+
+class _TimingFinder:
+    # duck-typed meta path finder; importlib.abc alone costs ~15 ms to import
+
+    def __init__(self, profiler: "StartupProfiler"):
+        self._profiler = profiler
+
+    def find_spec(self, name, path, target=None):
+        for finder in sys.meta_path:
+            find_spec = getattr(finder, "find_spec", None)
+            if finder is self or find_spec is None:
+                continue
+            spec = find_spec(name, path, target)
+            if spec is not None:
+                break
+        else:
+            return None
+        if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+            spec.loader = _TimingLoader(spec.loader, self._profiler)
+        return spec
+
+
+class StartupProfiler:
+    """Time from launch to "Ready", split per import and per init phase.
+
+    Imports are grouped by top-level package and charged self time only,
+    so a package's total doesn't include what its own imports cost.
+    Recording stops at finish(); later phases are not timed.
+    """
+
+    def __init__(self):
+        self.launched_ns = perf_counter_ns()
+        self.phases: list[tuple[str, int]] = []
+        self.marks: dict[str, int] = {}
+        self.imports: dict[str, list[int]] = {}     # package -> [self ns, modules]
+        self.done = False
+        self._finder: _TimingFinder | None = None
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def install(self, launched_ns: int | None = None):
+        """Start timing imports. Pass the launch time if imports happened
+        before this module was loaded; they are reported as one phase."""
+        if launched_ns is not None:
+            self.phases.append(("pre-profiler imports", perf_counter_ns() - launched_ns))
+            self.launched_ns = launched_ns
+        if self._finder is None:
+            self._finder = _TimingFinder(self)
+            sys.meta_path.insert(0, self._finder)
+
+    def uninstall(self):
+        if self._finder is not None:
+            sys.meta_path.remove(self._finder)
+            self._finder = None
+
+    @contextmanager
+    def phase(self, name: str):
+        start = perf_counter_ns()
+        try:
+            yield
+        finally:
+            if not self.done:
+                with self._lock:
+                    self.phases.append((name, perf_counter_ns() - start))
+
+    def mark(self, name: str):
+        """Record the time since launch, e.g. mark("ready")."""
+        if not self.done:
+            self.marks.setdefault(name, perf_counter_ns() - self.launched_ns)
+
+    def finish(self):
+        self.mark("finished")
+        self.uninstall()
+        self.done = True
+
+    def report(self, top: int = 10) -> str:
+        marks = ", ".join(f"{name} at {ns / 1e6:.1f} ms" for name, ns in self.marks.items())
+        lines = [f"Startup: {marks or 'no marks'}", "  phases:"]
+        lines += [f"    {name:<24} {ns / 1e6:8.1f} ms" for name, ns in self.phases]
+        with self._lock:
+            imports = sorted(self.imports.items(), key=lambda kv: kv[1][0], reverse=True)
+        total = sum(ns for ns, _ in self.imports.values())
+        lines.append(f"  imports: {total / 1e6:.1f} ms in "
+                     f"{sum(n for _, n in self.imports.values())} modules")
+        lines += [f"    {package:<24} {ns / 1e6:8.1f} ms  ({n} modules)"
+                  for package, (ns, n) in imports[:top]]
+        return "\n".join(lines)
+
+    def log_report(self):
+        logger.info(self.report())
+
+    @contextmanager
+    def _timed(self, name: str, count: bool = True):
+        stack = self._local.__dict__.setdefault("stack", [])
+        stack.append(0)                     # time spent in nested imports
+        start = perf_counter_ns()
+        try:
+            yield
+        finally:
+            elapsed = perf_counter_ns() - start
+            nested = stack.pop()
+            if stack:
+                stack[-1] += elapsed
+            package = name.partition(".")[0]
+            with self._lock:
+                entry = self.imports.setdefault(package, [0, 0])
+                entry[0] += elapsed - nested
+                entry[1] += count
+
+
+PROFILER = StartupProfiler()
@@ -0,0 +1,294 @@
+import logging
+import struct
+import threading
+import time
+from time import perf_counter_ns
+from typing import Callable, Iterator, NamedTuple
+
+from .backends.focus import FakeFocusBackend, FocusBackend
+from .backends.keyboard import KEY_DOWN, FakeKeyboardBackend, KeyboardBackend
+from .backends.mouse import FakeMouseBackend, MouseBackend
+
+logger = logging.getLogger(__name__)
+
+# File layout: a header, then fixed-size records. A FOCUS record is followed
+# by `b` bytes of UTF-8 process name.
+#   header: magic, version, wall-clock start (ns since the epoch)
+#   record: µs since the previous record, kind, a, b
+MAGIC = b"HMTR"
+VERSION = 1
+_HEADER = struct.Struct("<4sHQ")
+_RECORD = struct.Struct("<IBii")
+_MAX_DELTA_US = 0xFFFFFFFF
+
+# record kinds and their (a, b)
+KEY_PRESS = 1       # scan code, 0
+KEY_RELEASE = 2     # scan code, 0
+MOVE = 3            # x, y
+FOCUS = 4           # pid, name length
+
+
+class TraceEvent(NamedTuple):
+    t_us: int           # since the start of the trace
+    kind: int
+    a: int
+    b: int
+    name: str | None = None
+
+
+class TraceWriter:
+    """Appends input events to a binary trace file. Safe to call from the
+    hook threads; the file is buffered and written out on close()."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "wb")
+        self._file.write(_HEADER.pack(MAGIC, VERSION, time.time_ns()))
+        self._last_ns = perf_counter_ns()
+        self._lock = threading.Lock()
+        self.count = 0
+
+    def key(self, event_type: str, scan_code: int):
+        self._write(KEY_PRESS if event_type == KEY_DOWN else KEY_RELEASE, scan_code, 0)
+
+    def move(self, x: int, y: int):
+        self._write(MOVE, x, y)
+
+    def focus(self, pid: int, name: str | None):
+        data = (name or "").encode("utf-8")
+        self._write(FOCUS, pid, len(data), data)
+
+    def _write(self, kind: int, a: int, b: int, data: bytes = b""):
+        with self._lock:
+            if self._file is None:
+                return
+            now = perf_counter_ns()
+            delta_us = min((now - self._last_ns) // 1000, _MAX_DELTA_US)
+            self._last_ns += delta_us * 1000    # keep the rounding from drifting
+            self._file.write(_RECORD.pack(delta_us, kind, a, b) + data)
+            self.count += 1
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+                logger.info("Trace: %d events written to %s", self.count, self.path)
+
+
+def read_trace(path: str) -> tuple[int, list[TraceEvent]]:
+    """Returns the wall-clock start (ns since the epoch) and the events."""
+    with open(path, "rb") as f:
+        data = f.read()
+    if len(data) < _HEADER.size:
+        raise ValueError(f"{path}: not a trace file")
+    magic, version, started_ns = _HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError(f"{path}: not a trace file")
+    if version != VERSION:
+        raise ValueError(f"{path}: unsupported trace version {version}")
+    return started_ns, list(_iter_records(data, _HEADER.size))
+
+
+def write_trace(path: str, events, started_ns: int | None = None) -> None:
+    """Write events (e.g. a trimmed or synthetic trace) in the file format."""
+    with open(path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, started_ns or time.time_ns()))
+        t_us = 0
+        for event in events:
+            data = (event.name or "").encode("utf-8") if event.kind == FOCUS else b""
+            b = len(data) if event.kind == FOCUS else event.b
+            f.write(_RECORD.pack(event.t_us - t_us, event.kind, event.a, b) + data)
+            t_us = event.t_us
+
+
+def _iter_records(data: bytes, offset: int) -> Iterator[TraceEvent]:
+    t_us = 0
+    end = len(data) - _RECORD.size
+    while offset <= end:
+        delta_us, kind, a, b = _RECORD.unpack_from(data, offset)
+        offset += _RECORD.size
+        t_us += delta_us
+        name = None
+        if kind == FOCUS:
+            name = data[offset:offset + b].decode("utf-8") or None
+            offset += b
+        yield TraceEvent(t_us, kind, a, b, name)
+
+
+def replay(events, keyboard: FakeKeyboardBackend, mouse: FakeMouseBackend,
+           focus: FakeFocusBackend, speed: float = 0.0, on_focus=None) -> int:
+    """Feed recorded events to the fake backends on the calling thread.
+
+    speed 1.0 keeps the recorded timing, 2.0 runs twice as fast and 0 sends
+    every event as fast as possible. `on_focus(event)` is called after each
+    FOCUS event, e.g. to wait for the FocusWatcher when speed 0 would
+    otherwise press keys before it has seen the switch. Returns the number
+    of events sent.
+    """
+    start = perf_counter_ns()
+    sent = 0
+    for event in events:
+        if speed:
+            delay = event.t_us / speed / 1e6 - (perf_counter_ns() - start) / 1e9
+            if delay > 0:
+                time.sleep(delay)
+        if event.kind == KEY_PRESS:
+            keyboard.press(event.a)
+        elif event.kind == KEY_RELEASE:
+            keyboard.release(event.a)
+        elif event.kind == MOVE:
+            mouse.user_move(event.a, event.b)
+        elif event.kind == FOCUS:
+            focus.set_foreground(event.a, event.name)
+            if on_focus:
+                on_focus(event)
+        else:
+            logger.warning("Trace: skipping unknown record kind %d", event.kind)
+            continue
+        sent += 1
+    return sent
+
+
+# ───────── recording wrappers around the real backends ─────────
+class RecordingKeyboardBackend(KeyboardBackend):
+    """The hook is global, so a press is only recorded when
+    `record_key(scan_code)` allows it; typing in other applications (e.g. a
+    password) never reaches the trace. A release is recorded whenever its
+    press was."""
+
+    def __init__(self, inner: KeyboardBackend, writer: TraceWriter,
+                 record_key: Callable[[int], bool] = lambda scan_code: True):
+        self.inner = inner
+        self.writer = writer
+        self.record_key = record_key
+        self._held: set[int] = set()    # hook thread only
+
+    def hook(self, callback, suppress=False):
+        def _recorded(event):
+            scan_code = event.scan_code
+            if event.event_type == KEY_DOWN:
+                if scan_code in self._held or self.record_key(scan_code):
+                    self._held.add(scan_code)
+                    self.writer.key(event.event_type, scan_code)
+            elif scan_code in self._held:
+                self._held.discard(scan_code)
+                self.writer.key(event.event_type, scan_code)
+            return callback(event)
+        return self.inner.hook(_recorded, suppress=suppress)
+
+    def probe(self):
+        return self.inner.probe()
+
+    def last_input_ns(self):
+        return self.inner.last_input_ns()
+
+    def reinstall(self):
+        self.inner.reinstall()
+
+
+class RecordingMouseBackend(MouseBackend):
+    """Records the moves the suppressing hook reports while frozen;
+    programmatic position changes are outputs and are not recorded."""
+
+    def __init__(self, inner: MouseBackend, writer: TraceWriter):
+        self.inner = inner
+        self.writer = writer
+
+    @property
+    def position(self) -> tuple[int, int]:
+        return self.inner.position
+
+    @position.setter
+    def position(self, value) -> None:
+        self.inner.position = value
+
+    def press(self, button: str) -> None:
+        self.inner.press(button)
+
+    def release(self, button: str) -> None:
+        self.inner.release(button)
+
+    def start_suppressing(self, on_move) -> None:
+        def _recorded(x, y):
+            self.writer.move(x, y)
+            on_move(x, y)
+        self.inner.start_suppressing(_recorded)
+
+    def stop_suppressing(self) -> None:
+        self.inner.stop_suppressing()
+
+    def warm_up(self) -> None:
+        self.inner.warm_up()
+
+    def close(self) -> None:
+        self.inner.close()
+
+    @property
+    def last_event_ns(self) -> int:
+        return self.inner.last_event_ns
+
+    @last_event_ns.setter
+    def last_event_ns(self, value: int) -> None:
+        self.inner.last_event_ns = value
+
+    def probe(self) -> bool:
+        return self.inner.probe()
+
+    def last_input_ns(self) -> int | None:
+        return self.inner.last_input_ns()
+
+    def reinstall(self) -> None:
+        self.inner.reinstall()
+
+
+class RecordingFocusBackend(FocusBackend):
+    """Records each foreground change with its process name, so a replay
+    does not depend on the processes that were running. Nothing is recorded
+    after FocusWatcher falls back to polling."""
+
+    def __init__(self, inner: FocusBackend, writer: TraceWriter):
+        self.inner = inner
+        self.writer = writer
+
+    def start(self, on_change) -> None:
+        def _recorded(pid):
+            self.writer.focus(pid, self.inner.process_name(pid))
+            on_change(pid)
+        self.inner.start(_recorded)
+
+    def stop(self) -> None:
+        self.inner.stop()
+
+    def foreground_pid(self) -> int | None:
+        return self.inner.foreground_pid()
+
+    def process_name(self, pid: int) -> str | None:
+        return self.inner.process_name(pid)
+
+    def process_create_time(self, pid: int) -> float | None:
+        return self.inner.process_create_time(pid)
+
+
+def recording_backends(writer: TraceWriter) -> dict:
+    """The default backends wrapped to record into `writer`, as keyword
+    arguments for main() / the runtimes. Keys are recorded only while the
+    game has focus and only if the dispatcher binds them."""
+    from .backends.focus import default_focus_backend
+    from .backends.keyboard import default_keyboard_backend
+    from .backends.mouse import default_mouse_backend
+    from .focus_watcher import FocusWatcher
+    from .hotkey_handler import KeyboardDispatcher
+
+    def _record_key(scan_code: int) -> bool:
+        # the singletons are looked up per key: a hot restart replaces them
+        watcher, dispatcher = FocusWatcher._instance, KeyboardDispatcher._instance
+        return (watcher is not None and watcher.game_focused
+                and dispatcher is not None and dispatcher.handles(scan_code))
+
+    return dict(
+        focus_backend=RecordingFocusBackend(default_focus_backend(), writer),
+        keyboard_backend=RecordingKeyboardBackend(default_keyboard_backend(), writer,
+                                                  _record_key),
+        mouse_backend=RecordingMouseBackend(default_mouse_backend(), writer),
+    )
@@ -12,6 +12,6 @@ def handle_errors(func):
             return func(*args, **kwargs)
         except Exception as e:
             # use that module logger instead of the root logger
-            logger.exception(f"Error in {func.__name__}: {e}", exc_info=True)
+            logger.exception("Error in %s: %s", func.__name__, e)
             # logger.info(f"Error in {func.__name__}: {e}")
     return wrapper
@@ -0,0 +1,114 @@
+import logging
+from time import monotonic_ns
+
+from .config import Config
+from .metrics import REGISTRY
+from .scheduler import Job, Scheduler
+
+logger = logging.getLogger(__name__)
+
+
+class _Watch:
+    __slots__ = ("name", "hook", "user_input", "probe_ns", "reinstalls", "detection")
+
+    def __init__(self, name: str, hook, user_input: bool):
+        self.name = name
+        self.hook = hook
+        self.user_input = user_input
+        self.probe_ns = 0
+        self.reinstalls = REGISTRY.counter(f"watchdog.{name}.reinstalls")
+        # silence from the last delivered event to the reinstall
+        self.detection = REGISTRY.histogram(f"watchdog.{name}.detection")
+
+
+class HookWatchdog:
+    """Reinstalls hooks that stopped delivering events.
+
+    Every HOOK_WATCHDOG_INTERVAL s a hook that has been quiet for that long
+    is self-tested. If the test fails and nothing has arrived by the next
+    check, the hook is treated as dropped and reinstalled in place. A hook
+    that keeps delivering real events is never tested. No input is ever
+    injected: that would reset the OS idle timer (screensaver, lock, sleep)
+    and reach every other process's hooks.
+
+    A watched hook owner provides `last_event_ns` (monotonic_ns of the last
+    event its hook delivered), `probe() -> bool` and `reinstall()`. For a
+    plain hook, probe() is the self-test: it refreshes last_event_ns if the
+    hook is alive, and returns False if it can't tell.
+
+    Keyboard and mouse hooks are watched with user_input=True and also
+    provide `last_input_ns()`, the newest input the OS has seen; their
+    probe() only says whether they can be checked. Input newer than the
+    last event of every such hook reached none of them, which fails the
+    self-test of each quiet one. This needs all of them to be checkable.
+    """
+
+    def __init__(self):
+        self.config = Config()
+        self._watches: list[_Watch] = []
+        self._job: Job | None = None
+        self._version = 0
+        self._interval_ns = 0
+
+    def watch(self, name: str, hook, user_input: bool = False):
+        self._watches.append(_Watch(name, hook, user_input))
+
+    def start(self):
+        if self.config.snapshot.HOOK_WATCHDOG_INTERVAL:
+            self._job = Scheduler().register(
+                "watchdog.hooks", self.check,
+                lambda: self.config.snapshot.HOOK_WATCHDOG_INTERVAL, blocking=True)
+
+    def stop(self):
+        if self._job:
+            Scheduler().unregister(self._job)
+            self._job = None
+
+    def check(self) -> bool:
+        snapshot = self.config.snapshot
+        if snapshot.version != self._version:
+            self._version = snapshot.version
+            self._interval_ns = int(snapshot.HOOK_WATCHDOG_INTERVAL * 1e9)
+        interval_ns = self._interval_ns
+        missed = self._missed_input()
+        reinstalled = False
+        for watch in self._watches:
+            hook = watch.hook
+            now = monotonic_ns()
+            if watch.probe_ns and hook.last_event_ns < watch.probe_ns:
+                self._reinstall(watch, now)
+                reinstalled = True
+                continue
+            watch.probe_ns = 0
+            if now - hook.last_event_ns < interval_ns:
+                continue
+            if watch.user_input:
+                if missed:
+                    watch.probe_ns = now
+            elif hook.probe():
+                watch.probe_ns = now
+        return reinstalled
+
+    def _missed_input(self) -> bool:
+        """Whether the OS saw input that no keyboard or mouse hook delivered."""
+        hooks = [watch.hook for watch in self._watches if watch.user_input]
+        if not hooks or not all(hook.probe() for hook in hooks):
+            return False
+        inputs = [hook.last_input_ns() for hook in hooks]   # before the events
+        if None in inputs:
+            return False
+        return max(inputs) > max(hook.last_event_ns for hook in hooks)
+
+    def _reinstall(self, watch: _Watch, now: int):
+        silent_ns = now - watch.hook.last_event_ns
+        logger.warning("%s hook failed its self-test (silent %.0f ms); reinstalling",
+                       watch.name, silent_ns / 1e6)
+        watch.probe_ns = 0
+        try:
+            watch.hook.reinstall()
+        except Exception as e:
+            logger.exception("Reinstalling the %s hook failed: %s", watch.name, e)
+            return
+        watch.reinstalls.inc()
+        watch.detection.record(silent_ns)
+        watch.hook.last_event_ns = monotonic_ns()